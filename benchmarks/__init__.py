@@ -0,0 +1,18 @@
+"""
+Headless benchmarks of the engine. They run with the SDL dummy video and audio drivers, so no window is opened.
+
+Run all cases and print the results:
+    python -m benchmarks
+Save a baseline, then compare a later run against it (exits with 1 if something got slower than the threshold):
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --threshold 0.1
+See 'python -m benchmarks --help' for the other options.
+The memory footprint of the entities is measured apart (see 'benchmarks.memory'):
+    python -m benchmarks.memory
+"""
+
+import os
+
+#  must be set before pygame initializes the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,53 @@
+from benchmarks.cases import get_cases
+from benchmarks.cases import CASES
+from benchmarks.runner import compare
+from benchmarks.runner import load_baseline
+from benchmarks.runner import run_suite
+from benchmarks.runner import save_baseline
+import argparse
+import sys
+
+
+def output(text):
+    print text
+    sys.stdout.flush()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Headless benchmarks of the engine.")
+    parser.add_argument("cases", nargs="*", help="cases to run (default: all). Cases: " +
+                                                 ", ".join(spec.name for spec in CASES))
+    parser.add_argument("--frames", type=int, default=200, help="frames measured per metric (default: 200)")
+    parser.add_argument("--warmup", type=int, default=20, help="frames run before measuring (default: 20)")
+    parser.add_argument("--save", metavar="PATH", help="save the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results with a baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown tolerated when comparing, 0.1 is 10%% (default: 0.1)")
+    parser.add_argument("--statistic", choices=("median", "p95", "p99"), default="median",
+                        help="statistic compared with the baseline (default: median)")
+    arguments = parser.parse_args(arguments)
+
+    results = run_suite(get_cases(arguments.cases), arguments.frames, arguments.warmup, output)
+    if arguments.save:
+        save_baseline(results, arguments.save)
+        output("Baseline saved in " + arguments.save)
+
+    if not arguments.compare:
+        return 0
+    regressions = 0
+    output("")
+    output("Compared with " + arguments.compare + " (" + arguments.statistic + ")")
+    for name, metric, before, after, ratio, regressed in compare(results, load_baseline(arguments.compare),
+                                                                  arguments.threshold, arguments.statistic):
+        output("  %-16s %-16s %8.3f ms -> %8.3f ms  %+6.1f%%%s" %
+               (name, metric, before, after, (ratio - 1) * 100, "  SLOWER" if regressed else ""))
+        if regressed:
+            regressions += 1
+    if regressions > 0:
+        output(str(regressions) + " metrics slower than the threshold")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
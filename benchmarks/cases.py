@@ -0,0 +1,29 @@
+"""
+Default benchmark cases. Each one stresses a different part of the engine.
+"""
+
+from scenes import SceneSpec
+
+CASES = [
+    SceneSpec("game_objects", game_objects=2000, cameras=1),
+    SceneSpec("physics_sparse", colliders=1000, density=0.5),
+    SceneSpec("physics_dense", colliders=1000, density=4.0),
+    SceneSpec("sprites", layers=4, sprites_per_layer=1000),
+    SceneSpec("sprites_static", layers=4, sprites_per_layer=1000, static_layers=2),
+    SceneSpec("cameras", layers=2, sprites_per_layer=1000, cameras=4),
+    SceneSpec("mixed", game_objects=500, colliders=500, density=1.0, layers=3, sprites_per_layer=500, cameras=2),
+]
+
+
+def get_cases(names=None):
+    """
+    :param names: List with the names of the cases, or None for all
+    :return: List of SceneSpec
+    """
+    if not names:
+        return list(CASES)
+    by_name = dict((spec.name, spec) for spec in CASES)
+    for name in names:
+        if name not in by_name:
+            raise Exception("Unknown benchmark case: " + name + ". Cases: " + ", ".join(spec.name for spec in CASES))
+    return [by_name[name] for name in names]
@@ -0,0 +1,164 @@
+"""
+Memory footprint of the entities: the bytes of a game object with its transform and components, and how long
+creating and starting them takes.
+
+Print the footprint of each case:
+    python -m benchmarks.memory
+    python -m benchmarks.memory --entities 50000
+Save the results as a baseline, or compare them with one:
+    python -m benchmarks.memory --save memory.json
+    python -m benchmarks.memory --compare benchmarks/memory_before_slots.json
+
+'memory_before_slots.json' has the footprint before GameObject, Component and Transform had slots. It was saved by
+running this module, with '--entities 50000 --save', in a checkout of the commit before them (a git worktree),
+where 'Component.SLOTS' does not exist yet and 'SlottedTicker' declared ("_game_object", "_is_updating", "count")
+instead.
+
+The size of an entity is the sum of 'sys.getsizeof' of every object reachable from its game object that belongs
+only to it (instances, their '__dict__', dictionaries, lists, strings...). Classes, functions and modules are
+shared, so they are not counted.
+"""
+
+from timeit import default_timer
+from temdisponivellib import Component
+from temdisponivellib import GameObject
+from temdisponivellib import Scene
+from benchmarks.runner import get_game
+from benchmarks.scenes import Ticker
+import argparse
+import gc
+import json
+import platform
+import sys
+import types
+
+
+class SlottedTicker(Component):
+    """
+    Same as 'Ticker', but with slots (see 'Component').
+    """
+
+    __slots__ = Component.SLOTS + ("count",)
+
+    def __init__(self):
+        super(SlottedTicker, self).__init__()
+        self.count = 0
+
+    def update(self):
+        self.count += 1
+
+
+#  key: name of the case, value: list of component classes of each entity
+CASES = [
+    ("game_object", []),
+    ("ticker", [Ticker]),
+    ("slotted_ticker", [SlottedTicker]),
+    ("two_tickers", [Ticker, SlottedTicker]),
+]
+
+_shared_types = (type, types.ClassType, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                 types.NoneType, bool)
+
+
+def get_size(root):
+    """
+    :return: The sum of the sizes of the objects reachable from root, without the shared ones (classes, functions,
+    modules, None and booleans)
+    """
+    size = 0
+    seen = set()
+    pending = [root]
+    while len(pending) > 0:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, _shared_types):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return size
+
+
+def create_entity(component_classes):
+    game_object = GameObject()
+    for component_class in component_classes:
+        game_object.add_component(component_class())
+    return game_object
+
+
+def run_case(component_classes, entities=50000):
+    """
+    Create entities, start them in a scene and measure them.
+    :param component_classes: List of component classes added to each entity
+    :param entities: Number of entities
+    :return: Dictionary with the bytes per entity, how many of its objects (the game object and its components)
+    have a '__dict__' and how many it has, and the microseconds to create and to start each entity
+    """
+    game = get_game()
+    start = default_timer()
+    game_objects = [create_entity(component_classes) for index in xrange(entities)]
+    create_time = default_timer() - start
+
+    scene = Scene()
+    for game_object in game_objects:
+        scene.add_game_object(game_object)
+    start = default_timer()
+    game.scene = scene
+    game.run_frame()
+    start_time = default_timer() - start
+
+    sample = game_objects[len(game_objects) // 2]
+    objects = [sample] + sample.get_all_components()
+    result = {"bytes": get_size(sample),
+              "dicts": len([obj for obj in objects if hasattr(obj, "__dict__")]),
+              "objects": len(objects),
+              "create_us": create_time * 1000000 / entities,
+              "start_us": start_time * 1000000 / entities}
+    game.scene = Scene()
+    game.run_frame()
+    return result
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memory",
+                                     description="Memory footprint of the entities of the engine.")
+    parser.add_argument("--entities", type=int, default=50000, help="entities created per case (default: 50000)")
+    parser.add_argument("--save", metavar="PATH", help="save the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results with a baseline")
+    arguments = parser.parse_args(arguments)
+
+    print "%-16s %12s %10s %12s %12s" % ("case", "bytes/entity", "__dict__", "create us", "start us")
+    results = {}
+    for name, component_classes in CASES:
+        result = results[name] = run_case(component_classes, arguments.entities)
+        print "%-16s %12d %10s %12.2f %12.2f" % (name, result["bytes"],
+                                                 "%d of %d" % (result["dicts"], result["objects"]),
+                                                 result["create_us"], result["start_us"])
+        sys.stdout.flush()
+    results = {"version": 1,
+               "python": platform.python_version(),
+               "platform": platform.platform(),
+               "entities": arguments.entities,
+               "cases": results}
+
+    if arguments.save:
+        with open(arguments.save, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=1, sort_keys=True)
+        print "Baseline saved in " + arguments.save
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        print ""
+        print "Compared with " + arguments.compare
+        for name, result in sorted(results["cases"].iteritems()):
+            before = baseline["cases"].get(name)
+            if before is None:
+                continue
+            print "  %-16s %6d -> %6d bytes  %+6.1f%%   create %6.2f -> %6.2f us" % \
+                (name, before["bytes"], result["bytes"], (float(result["bytes"]) / before["bytes"] - 1) * 100,
+                 before["create_us"], result["create_us"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Runs the benchmark cases, computes their statistics and compares them with a baseline.
+"""
+
+from timeit import default_timer
+from temdisponivellib import Configuration
+from temdisponivellib import Game
+from temdisponivellib import Physics
+from scenes import build_scene
+import json
+import platform
+
+METRICS = ("scene_update", "check_collision", "scene_draw", "frame")
+
+
+def percentile(sorted_samples, fraction):
+    """
+    :param sorted_samples: Sorted list of samples
+    :param fraction: Fraction (0 to 1) of the percentile, 0.95 for p95
+    :return: The percentile, interpolating between the closest samples
+    """
+    if len(sorted_samples) == 0:
+        return 0.0
+    position = (len(sorted_samples) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """
+    :param samples: List of times, in seconds
+    :return: Dictionary with the median, p95, p99, min and max (in milliseconds) and the number of samples
+    """
+    samples = sorted(sample * 1000 for sample in samples)
+    return {"median": percentile(samples, 0.5),
+            "p95": percentile(samples, 0.95),
+            "p99": percentile(samples, 0.99),
+            "min": samples[0] if samples else 0.0,
+            "max": samples[-1] if samples else 0.0,
+            "samples": len(samples)}
+
+
+def get_game():
+    """
+    :return: The Game, started with a display of the dummy driver
+    """
+    game = Game.instance()
+    if game.surface is None:
+        Configuration()
+        game.start()
+    return game
+
+
+def run_case(spec, frames=200, warmup=20):
+    """
+    Build the scene of a case and time each phase for a number of frames: "scene_update" (the update of the
+    scene without the physics), "check_collision" (one collision check), "scene_draw" (drawing and flushing the
+    blits) and "frame" (whole frames, with the physics at its configured rate).
+    :param spec: SceneSpec
+    :param frames: Number of frames measured of each phase
+    :param warmup: Number of frames run before measuring
+    :return: Dictionary with the statistics (see 'summarize') of each metric
+    """
+    game = get_game()
+    game.scene = build_scene(spec)
+    game.run_frame()
+    scene = game.scene
+    for index in xrange(warmup):
+        game.run_frame()
+
+    samples = dict((metric, []) for metric in METRICS)
+    physics = Physics.instance()
+    blit_queue = game.blit_queue
+    for index in xrange(frames):
+        #  without the physics, it is measured apart as check_collision
+        start = default_timer()
+        scene.update_game_objects()
+        samples["scene_update"].append(default_timer() - start)
+
+        start = default_timer()
+        physics.check_collision()
+        samples["check_collision"].append(default_timer() - start)
+
+        start = default_timer()
+        scene.draw()
+        blit_queue.flush()
+        samples["scene_draw"].append(default_timer() - start)
+
+    for index in xrange(frames):
+        start = default_timer()
+        game.run_frame()
+        samples["frame"].append(default_timer() - start)
+
+    return dict((metric, summarize(metric_samples)) for metric, metric_samples in samples.iteritems())
+
+
+def run_suite(specs, frames=200, warmup=20, output=None):
+    """
+    Run cases and return the results in the format saved as baseline.
+    :param specs: List of SceneSpec
+    :param output: Function that receives a line of text to report the progress, or None
+    :return: Dictionary with the environment and the results of each case
+    """
+    results = {}
+    for spec in specs:
+        results[spec.name] = {"spec": spec.to_dict(), "metrics": run_case(spec, frames, warmup)}
+        if output is not None:
+            output(format_case(spec.name, results[spec.name]["metrics"]))
+    return {"version": 1,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "frames": frames,
+            "cases": results}
+
+
+def format_case(name, metrics):
+    lines = [name]
+    for metric in METRICS:
+        stats = metrics[metric]
+        lines.append("  %-16s median %8.3f ms   p95 %8.3f ms   p99 %8.3f ms" %
+                     (metric, stats["median"], stats["p95"], stats["p99"]))
+    return "\n".join(lines)
+
+
+def save_baseline(results, path):
+    with open(path, "w") as baseline_file:
+        json.dump(results, baseline_file, indent=1, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def compare(results, baseline, threshold=0.1, statistic="median"):
+    """
+    Compare results with a baseline. Only cases and metrics present in both are compared.
+    :param threshold: Fraction of slowdown tolerated, 0.1 flags metrics more than 10% slower
+    :param statistic: Statistic compared ("median", "p95" or "p99")
+    :return: List of tuples (case, metric, baseline value, current value, ratio, regressed) sorted by case and metric
+    """
+    comparison = []
+    for name, case in sorted(results["cases"].iteritems()):
+        baseline_case = baseline["cases"].get(name)
+        if baseline_case is None:
+            continue
+        for metric in METRICS:
+            if metric not in baseline_case["metrics"]:
+                continue
+            before = baseline_case["metrics"][metric][statistic]
+            after = case["metrics"][metric][statistic]
+            ratio = after / before if before > 0 else 1.0
+            comparison.append((name, metric, before, after, ratio, ratio > 1 + threshold))
+    return comparison
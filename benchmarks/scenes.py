@@ -0,0 +1,150 @@
+"""
+Parameterized scenes for the benchmarks.
+"""
+
+from pygame import Surface
+from temdisponivellib import BoxCollider
+from temdisponivellib import Camera
+from temdisponivellib import CircleCollider
+from temdisponivellib import Collider
+from temdisponivellib import Component
+from temdisponivellib import GameObject
+from temdisponivellib import Scene
+from temdisponivellib import SpriteRenderer
+import math
+import random
+
+
+class SceneSpec(object):
+    """
+    Description of a benchmark scene.
+    """
+
+    def __init__(self, name, game_objects=0, colliders=0, density=1.0, moving=0.5, layers=1, sprites_per_layer=0,
+                 static_layers=0, cameras=1, camera_size=(640, 480), seed=1):
+        """
+        :param name: Name of the case
+        :param game_objects: Number of game objects with only an updating component
+        :param colliders: Number of game objects with a collider (half boxes, half circles)
+        :param density: Colliders per 100x100 pixels. The world grows to keep this density
+        :param moving: Fraction (0 to 1) of the colliders that move every frame, the others are static
+        :param layers: Number of drawable layers
+        :param sprites_per_layer: Number of game objects with a sprite in each layer
+        :param static_layers: Number of layers, from the lowest, marked as static (see 'Scene.set_static_layer')
+        :param cameras: Number of cameras, spread over the world
+        :param camera_size: Size of each camera
+        :param seed: Seed of the random positions, so every run builds the same scene
+        """
+        self.name = name
+        self.game_objects = game_objects
+        self.colliders = colliders
+        self.density = density
+        self.moving = moving
+        self.layers = layers
+        self.sprites_per_layer = sprites_per_layer
+        self.static_layers = static_layers
+        self.cameras = cameras
+        self.camera_size = camera_size
+        self.seed = seed
+
+    @property
+    def world_size(self):
+        """
+        :return: Side of the square world, in pixels
+        """
+        count = max(self.colliders, self.layers * self.sprites_per_layer, 1)
+        return int(math.sqrt(count / float(self.density)) * 100)
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+
+class Mover(Component):
+    """
+    Component that moves its game object around its start position, so colliders keep colliding and separating.
+    """
+
+    def __init__(self, speed, phase):
+        super(Mover, self).__init__()
+        self._speed = speed
+        self._phase = phase
+        self._frame = 0
+        self._origin = None
+
+    def update(self):
+        if self._origin is None:
+            self._origin = (self.transform.x, self.transform.y)
+        self._frame += 1
+        angle = self._phase + self._frame * self._speed
+        self.transform.x = int(self._origin[0] + math.cos(angle) * 20)
+        self.transform.y = int(self._origin[1] + math.sin(angle) * 20)
+
+
+class Ticker(Component):
+    """
+    Component that only counts its updates, to measure the cost of updating game objects.
+    """
+
+    def __init__(self):
+        super(Ticker, self).__init__()
+        self.count = 0
+
+    def update(self):
+        self.count += 1
+
+
+def build_scene(spec):
+    """
+    Build a scene from a SceneSpec. The scene must be set in the Game (see 'Game.scene') to start.
+    :return: The scene
+    """
+    rand = random.Random(spec.seed)
+    world = spec.world_size
+    scene = Scene()
+
+    for index in xrange(spec.game_objects):
+        game_object = GameObject()
+        game_object.add_component(Ticker())
+        scene.add_game_object(game_object)
+
+    moving_count = int(spec.colliders * spec.moving)
+    for index in xrange(spec.colliders):
+        game_object = GameObject()
+        game_object.transform.x = rand.randint(0, world)
+        game_object.transform.y = rand.randint(0, world)
+        if index % 2 == 0:
+            collider = BoxCollider((rand.randint(10, 30), rand.randint(10, 30)))
+        else:
+            collider = CircleCollider(rand.randint(5, 15))
+        game_object.add_component(collider)
+        if index < moving_count:
+            game_object.add_component(Mover(rand.uniform(0.02, 0.1), rand.uniform(0, math.pi * 2)))
+        else:
+            collider.mode = Collider.STATIC
+        scene.add_game_object(game_object)
+
+    images = []
+    for index in xrange(4):
+        image = Surface((16, 16))
+        image.fill((60 * index, 255 - 60 * index, 128))
+        images.append(image)
+    for layer in xrange(spec.layers):
+        if layer < spec.static_layers:
+            scene.set_static_layer(layer)
+        for index in xrange(spec.sprites_per_layer):
+            game_object = GameObject()
+            game_object.transform.x = rand.randint(0, world)
+            game_object.transform.y = rand.randint(0, world)
+            sprite_renderer = SpriteRenderer()
+            sprite_renderer.image = rand.choice(images)
+            sprite_renderer.layer = layer
+            game_object.add_component(sprite_renderer)
+            scene.add_game_object(game_object)
+
+    for index in xrange(spec.cameras):
+        game_object = GameObject()
+        game_object.transform.x = int(world * (index + 0.5) / spec.cameras - spec.camera_size[0] / 2)
+        game_object.transform.y = int(world / 2 - spec.camera_size[1] / 2)
+        game_object.add_component(Camera(spec.camera_size))
+        scene.add_game_object(game_object)
+    return scene
@@ -1,19 +1,26 @@
-callback_functions = ["collision_enter", "collision_stay", "collision_exit"]
+callback_functions = ["collision_enter", "collision_stay", "collision_exit", "collision_events"]
 length_area_world = 75
+collision_layers = 32
 raise_exception = False
 
 #  import all required modules
 from game import *
+from blitqueue import *
+from profiler import *
 from gameobject import *
 from contracts import *
 from configuration import *
 from component import *
 from loader import *
+from audio import *
 from physics import *
+from broadphase import *
+from query import *
 from scene import *
 from timeutils import *
 from builtincomponents import *
 from builtincomponents.camera import *
 from builtincomponents.collider import *
 from builtincomponents.sprite_renderer import *
-from builtincomponents.transform import *
\ No newline at end of file
+from builtincomponents.transform import *
+from builtincomponents.performance_overlay import *
\ No newline at end of file
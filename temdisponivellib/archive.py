@@ -0,0 +1,219 @@
+"""
+Packed archive of assets, so a shipped game opens one file instead of thousands.
+
+Layout (little endian):
+    header: magic "TDPK", version (uint16), number of entries (uint32)
+    index: for each entry, name length (uint16), name (utf-8, '/' separated, relative to the assets directory),
+           kind (uint8), offset (uint64) and size (uint64) of its blob
+    blobs: the files. Raw blobs are the bytes of the file. Decoded blobs are images already decoded: width and height
+           (uint32), pixel format (4 bytes, "RGBA" or "RGB ") and the pixels
+
+Build an archive with:
+    python -m temdisponivellib.archive build <archive> <assets directory> [--decode-images]
+Pack images into a texture atlas (see 'TextureAtlas') with:
+    python -m temdisponivellib.archive atlas <atlas index> <image>... [--page-size W H] [--padding P]
+"""
+
+from pygame import image as pyimage
+from pygame import mixer
+from pygame import SRCALPHA
+from cStringIO import StringIO
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+_MAGIC = "TDPK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+_ENTRY = struct.Struct("<BQQ")
+_NAME_LENGTH = struct.Struct("<H")
+_IMAGE_HEADER = struct.Struct("<II4s")
+
+RAW = 0
+DECODED_IMAGE = 1
+
+IMAGE_EXTENSIONS = (".png", ".bmp", ".jpg", ".jpeg", ".gif", ".tga", ".pcx", ".tif", ".tiff", ".webp")
+
+
+class AssetArchive(object):
+    """
+    Archive opened with mmap. Assets are read from slices of the mapped file ('buffer' objects, the zero copy
+    slices of Python 2, as 'memoryview' doesn't support mmap), without opening a file per asset.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        with open(path, "rb") as archive_file:
+            self._mmap = mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._entries = AssetArchive._read_index(self._mmap)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def names(self):
+        """
+        :return: List with the names of the assets
+        """
+        return self._entries.keys()
+
+    @property
+    def path(self):
+        return self._path
+
+    def get_kind(self, name):
+        """
+        :return: RAW or DECODED_IMAGE
+        """
+        return self._entries[name][0]
+
+    def get_buffer(self, name):
+        """
+        :return: A read only buffer over the blob of the asset. No bytes are copied
+        """
+        kind, offset, size = self._entries[name]
+        return buffer(self._mmap, offset, size)
+
+    def open(self, name):
+        """
+        :return: A read only file-like object with the content of a raw asset. It reads from the mapped file, no
+        bytes are copied
+        """
+        return StringIO(self.get_buffer(name))
+
+    def load_image(self, name):
+        """
+        Load an image. Decoded images are copied from the mapped pixels in one pass, the others are decoded from
+        the blob. The surface owns its pixels: the mapping is read only, so a surface over it would crash when drawn
+        on.
+        :return: The image (not converted)
+        """
+        kind, offset, size = self._entries[name]
+        if kind == DECODED_IMAGE:
+            width, height, pixel_format = _IMAGE_HEADER.unpack_from(self._mmap, offset)
+            pixels = buffer(self._mmap, offset + _IMAGE_HEADER.size, size - _IMAGE_HEADER.size)
+            return pyimage.frombuffer(pixels, (width, height), pixel_format.strip()).copy()
+        return pyimage.load(self.open(name), name)
+
+    def load_sound(self, name):
+        """
+        :return: A sound decoded from the blob of the asset
+        """
+        return mixer.Sound(file=self.open(name))
+
+    def close(self):
+        """
+        Stop using the archive. The mapping is unmapped when nothing else uses it (the buffers given by
+        'get_buffer' and 'open'), so closing is always safe.
+        """
+        self._mmap = None
+        self._entries = {}
+
+    @staticmethod
+    def _read_index(data):
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise Exception("Not an asset archive")
+        if version != _VERSION:
+            raise Exception("Unsupported asset archive version: " + str(version))
+        entries = {}
+        position = _HEADER.size
+        for index in xrange(count):
+            name_length, = _NAME_LENGTH.unpack_from(data, position)
+            position += _NAME_LENGTH.size
+            name = data[position:position + name_length].decode("utf-8")
+            position += name_length
+            entries[name] = _ENTRY.unpack_from(data, position)
+            position += _ENTRY.size
+        return entries
+
+    @staticmethod
+    def build(archive_path, directory, decode_images=False):
+        """
+        Build an archive with all files of a directory (and its subdirectories).
+        :param archive_path: Path of the archive to create
+        :param directory: Directory with the assets, usually 'Loader.base_path'
+        :param decode_images: If true, images are stored decoded, so loading them is only a copy when converting.
+        Bigger archive, but no decoding at runtime
+        :return: Number of assets in the archive
+        """
+        names = []
+        for root, directories, files in os.walk(directory):
+            directories.sort()
+            for file_name in sorted(files):
+                full_path = os.path.join(root, file_name)
+                names.append(os.path.relpath(full_path, directory).replace(os.sep, "/"))
+
+        blobs = []
+        for name in names:
+            full_path = os.path.join(directory, *name.split("/"))
+            if decode_images and name.lower().endswith(IMAGE_EXTENSIONS):
+                blobs.append((DECODED_IMAGE, AssetArchive._decode_image(full_path)))
+            else:
+                with open(full_path, "rb") as asset_file:
+                    blobs.append((RAW, asset_file.read()))
+
+        encoded_names = [name.encode("utf-8") for name in names]
+        offset = _HEADER.size + sum(_NAME_LENGTH.size + len(name) + _ENTRY.size for name in encoded_names)
+        with open(archive_path, "wb") as archive_file:
+            archive_file.write(_HEADER.pack(_MAGIC, _VERSION, len(names)))
+            for name, (kind, blob) in zip(encoded_names, blobs):
+                archive_file.write(_NAME_LENGTH.pack(len(name)))
+                archive_file.write(name)
+                archive_file.write(_ENTRY.pack(kind, offset, len(blob)))
+                offset += len(blob)
+            for kind, blob in blobs:
+                archive_file.write(blob)
+        return len(names)
+
+    @staticmethod
+    def _decode_image(full_path):
+        image = pyimage.load(full_path)
+        pixel_format = "RGBA" if image.get_flags() & SRCALPHA or image.get_colorkey() is not None else "RGB "
+        pixels = pyimage.tostring(image, pixel_format.strip())
+        return _IMAGE_HEADER.pack(image.get_width(), image.get_height(), pixel_format) + pixels
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog="python -m temdisponivellib.archive",
+                                     description="Build and inspect asset archives.")
+    subparsers = parser.add_subparsers(dest="command")
+    build_parser = subparsers.add_parser("build", help="pack a directory of assets into an archive")
+    build_parser.add_argument("archive", help="path of the archive to create")
+    build_parser.add_argument("directory", help="directory with the assets")
+    build_parser.add_argument("--decode-images", action="store_true",
+                              help="store images decoded, so they load without decoding")
+    atlas_parser = subparsers.add_parser("atlas", help="pack images into a texture atlas")
+    atlas_parser.add_argument("atlas", help="path of the index of the atlas to create (json)")
+    atlas_parser.add_argument("images", nargs="+", help="images to pack, named by these paths in the atlas")
+    atlas_parser.add_argument("--page-size", nargs=2, type=int, default=[1024, 1024], metavar=("WIDTH", "HEIGHT"))
+    atlas_parser.add_argument("--padding", type=int, default=1)
+    list_parser = subparsers.add_parser("list", help="list the assets of an archive")
+    list_parser.add_argument("archive", help="path of the archive")
+    arguments = parser.parse_args(arguments)
+
+    if arguments.command == "build":
+        count = AssetArchive.build(arguments.archive, arguments.directory, arguments.decode_images)
+        print "Packed " + str(count) + " assets into " + arguments.archive
+    elif arguments.command == "atlas":
+        from loader import TextureAtlas
+        images = dict((path, pyimage.load(path)) for path in arguments.images)
+        atlas = TextureAtlas.build(images, tuple(arguments.page_size), arguments.padding)
+        atlas.save(arguments.atlas)
+        print "Packed " + str(len(atlas)) + " images into " + str(len(atlas.pages)) + " pages"
+    else:
+        archive = AssetArchive(arguments.archive)
+        for name in sorted(archive.names):
+            kind = "decoded" if archive.get_kind(name) == DECODED_IMAGE else "raw"
+            print name + " (" + kind + ", " + str(len(archive.get_buffer(name))) + " bytes)"
+        archive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
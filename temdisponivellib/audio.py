@@ -0,0 +1,209 @@
+from pygame import mixer
+from configuration import Configuration
+from loader import Loader
+
+
+class Audio(object):
+    """
+    Plays the sounds of the game on a pool of mixer channels (see 'Configuration.audio_channels').
+    Each sound can have a maximum number of voices playing at the same time: playing it again restarts its
+    oldest voice. When all channels are busy, the new sound steals the channel of the voice with the lowest
+    priority (the oldest one among equals), if that priority isn't higher than its own. Otherwise it isn't played.
+    Music is streamed from the file by 'pygame.mixer.music', never decoded whole into memory.
+    """
+
+    _instance = None
+
+    def __init__(self):
+        if Audio._instance is None:
+            Audio._instance = self
+        else:
+            pass
+        self._channels = []
+        self._voices = {}
+        self._max_voices_by_sound = {}
+        self._voice_order = 0
+        self._started_count = 0
+        self._stolen_count = 0
+        self._dropped_count = 0
+        self._music_path = None
+
+    def set_configuration(self):
+        """
+        Create the channel pool based on the current configuration. Called by 'Game.set_configuration'.
+        """
+        if mixer.get_init() is None:
+            return
+        for channel in self._channels:
+            channel.stop()
+        number = Configuration.instance().audio_channels
+        mixer.set_num_channels(number)
+        self._channels = [mixer.Channel(index) for index in xrange(number)]
+        self._voices = {}
+
+    def update(self):
+        """
+        Forget the voices that finished and start counting the voices of a new frame. Called by 'Game.play' every
+        frame.
+        """
+        for channel in [channel for channel, voice in self._voices.iteritems() if channel.get_sound() is not voice[0]]:
+            del self._voices[channel]
+        self._started_count = 0
+        self._stolen_count = 0
+        self._dropped_count = 0
+
+    def play(self, sound, priority=0, loops=0, volume=1.0):
+        """
+        Play a sound on a channel of the pool.
+        :param sound: Sound (see 'Loader.load_sound')
+        :param priority: Priority of this voice. Voices with higher priority steal the channels of the lower ones
+        :param loops: Times to repeat the sound after the first time, -1 to repeat forever
+        :param volume: Volume (0 to 1) of this voice
+        :return: The channel playing the sound, or None if it wasn't played
+        """
+        channel = self._get_channel(sound, priority)
+        if channel is None:
+            self._dropped_count += 1
+            return None
+        channel.set_volume(volume)
+        channel.play(sound, loops)
+        self._voice_order += 1
+        self._voices[channel] = (sound, priority, self._voice_order)
+        self._started_count += 1
+        return channel
+
+    def _get_channel(self, sound, priority):
+        max_voices = self._max_voices_by_sound.get(sound)
+        if max_voices is not None:
+            voices = [(voice[2], channel) for channel, voice in self._voices.iteritems() if voice[0] is sound]
+            if len(voices) >= max_voices:
+                return min(voices)[1]
+
+        for channel in self._channels:
+            if channel not in self._voices:
+                return channel
+
+        victim = None
+        victim_key = None
+        for channel, (voice_sound, voice_priority, voice_order) in self._voices.iteritems():
+            if voice_priority <= priority and (victim_key is None or (voice_priority, voice_order) < victim_key):
+                victim = channel
+                victim_key = (voice_priority, voice_order)
+        if victim is not None:
+            self._stolen_count += 1
+        return victim
+
+    def stop(self, sound=None):
+        """
+        Stop all voices of a sound, or all voices if sound is None.
+        """
+        for channel in self._voices.keys():
+            if sound is None or self._voices[channel][0] is sound:
+                channel.stop()
+                del self._voices[channel]
+
+    def set_max_voices(self, sound, max_voices):
+        """
+        Set how many voices of a sound can play at the same time.
+        :param sound: Sound
+        :param max_voices: Maximum number of voices, or None for no limit
+        """
+        if max_voices is None:
+            self._max_voices_by_sound.pop(sound, None)
+        else:
+            self._max_voices_by_sound[sound] = max_voices
+
+    def get_max_voices(self, sound):
+        return self._max_voices_by_sound.get(sound)
+
+    def get_voice_count(self, sound=None):
+        """
+        :return: Number of voices of a sound playing, or of all sounds if sound is None
+        """
+        if sound is None:
+            return len(self._voices)
+        return sum(1 for voice in self._voices.itervalues() if voice[0] is sound)
+
+    def play_music(self, path, loops=-1, fade_ms=0):
+        """
+        Stream a music. Only one music plays at a time, playing another replaces it.
+        :param path: Path of the music, like in 'Loader.load_sound'. Musics in the archive (see 'Loader.open_archive')
+        are streamed from it
+        :param loops: Times to repeat the music after the first time, -1 to repeat forever
+        :param fade_ms: Milliseconds to fade in
+        """
+        if mixer.get_init() is None:
+            return
+        archive = Loader.archive
+        name = None if archive is None else Loader.get_archive_name(path)
+        if name is not None and name in archive:
+            mixer.music.load(archive.open(name))
+        else:
+            mixer.music.load(path)
+        mixer.music.play(loops, 0.0, fade_ms)
+        self._music_path = path
+
+    def stop_music(self, fade_ms=0):
+        """
+        Stop the music, fading out for fade_ms milliseconds if it is more than 0.
+        """
+        if mixer.get_init() is None:
+            return
+        if fade_ms > 0:
+            mixer.music.fadeout(fade_ms)
+        else:
+            mixer.music.stop()
+        self._music_path = None
+
+    @property
+    def music_path(self):
+        """
+        :return: Path of the music playing, or None
+        """
+        return self._music_path
+
+    @property
+    def music_volume(self):
+        return mixer.music.get_volume()
+
+    @music_volume.setter
+    def music_volume(self, volume):
+        mixer.music.set_volume(volume)
+
+    @property
+    def voice_count(self):
+        """
+        :return: Number of voices playing
+        """
+        return len(self._voices)
+
+    @property
+    def started_count(self):
+        """
+        :return: Number of voices started in this frame
+        """
+        return self._started_count
+
+    @property
+    def stolen_count(self):
+        """
+        :return: Number of voices that lost their channel to a new voice in this frame
+        """
+        return self._stolen_count
+
+    @property
+    def dropped_count(self):
+        """
+        :return: Number of sounds not played in this frame because no channel could be used
+        """
+        return self._dropped_count
+
+    @property
+    def channel_count(self):
+        return len(self._channels)
+
+    @staticmethod
+    def instance():
+        if Audio._instance is None:
+            Audio._instance = Audio()
+        return Audio._instance
@@ -0,0 +1,161 @@
+from pygame import Rect
+
+
+class BlitQueue(object):
+    """
+    Queue of blits. Instead of blitting each drawable as soon as it is drawn, drawers push the blits into this
+    queue and, at the end of the frame, all blits of each target surface are done with only one 'Surface.blits'.
+    Blits of the same target are done in the order they were pushed, unless a 'sort_key' is set.
+    """
+
+    def __init__(self):
+        self._targets = []
+        self._blits_by_target = {}
+        self._sort_key = None
+        self._flushed_count = 0
+        self._last_blits = None
+        self._marked_dirty = []
+
+    def push(self, target, source, dest, area=None):
+        """
+        Queue a blit of source into target.
+        :param target: Surface to blit into
+        :param source: Surface to blit
+        :param dest: Position or rect of the destination (like in 'Surface.blit')
+        :param area: Area of the source to blit, or None for the whole source
+        """
+        blits = self._blits_by_target.get(target)
+        if blits is None:
+            blits = self._blits_by_target[target] = []
+            self._targets.append(target)
+        blits.append((source, dest, area))
+
+    def flush(self):
+        """
+        Do all queued blits, one 'Surface.blits' call per target, and empty the queue.
+        """
+        count = 0
+        for target in self._targets:
+            blits = self._blits_by_target[target]
+            if self._sort_key is not None:
+                blits.sort(key=self._sort_key)
+            BlitQueue._blit_all(target, blits)
+            count += len(blits)
+        self._targets = []
+        self._blits_by_target = {}
+        self._flushed_count = count
+
+    def flush_dirty(self, target, background_color, max_dirty_area):
+        """
+        Do the queued blits of target redrawing only what changed since the last call: the areas of blits that are
+        new, moved, changed source or were not pushed again (removed), plus the areas marked with 'mark_dirty'.
+        Each of these areas is filled with the background color and the blits that overlap it are redrawn,
+        clipped to it. The blits of other targets are flushed as usual.
+        Note that changes in the pixels of a source surface are not detected, use 'mark_dirty' for those.
+        :param target: Surface to redraw. It must keep the content of the last frame
+        :param background_color: Color of the background
+        :param max_dirty_area: Fraction (0 to 1) of the area of target. If the dirty areas sum more than that,
+        all target is redrawn
+        :return: List with the rects that changed (to use in 'pygame.display.update'), or None if all target was
+        redrawn
+        """
+        blits = self._blits_by_target.pop(target, [])
+        if target in self._targets:
+            self._targets.remove(target)
+        if self._sort_key is not None:
+            blits.sort(key=self._sort_key)
+
+        target_rect = target.get_rect()
+        rects = []
+        current_blits = {}
+        for source, dest, area in blits:
+            if area is None:
+                width, height = source.get_size()
+            else:
+                width, height = area[2], area[3]
+            rect = Rect(dest[0], dest[1], width, height).clip(target_rect)
+            rects.append(rect)
+            area_key = None if area is None else tuple(area)
+            current_blits[source, tuple(rect), area_key] = rect
+
+        last_blits = self._last_blits
+        self._last_blits = current_blits
+        marked_dirty = self._marked_dirty
+        self._marked_dirty = []
+        self.flush()
+        self._flushed_count += len(blits)
+
+        if last_blits is not None:
+            dirty = [rect for key, rect in current_blits.iteritems() if key not in last_blits]
+            dirty.extend(rect for key, rect in last_blits.iteritems() if key not in current_blits)
+            dirty.extend(Rect(rect).clip(target_rect) for rect in marked_dirty)
+            dirty = [rect for rect in dirty if rect.width > 0 and rect.height > 0]
+            dirty_area = sum(rect.width * rect.height for rect in dirty)
+            if dirty_area <= max_dirty_area * target_rect.width * target_rect.height:
+                for rect in dirty:
+                    target.set_clip(rect)
+                    target.fill(background_color, rect)
+                    BlitQueue._blit_all(target, [blits[index] for index in rect.collidelistall(rects)])
+                target.set_clip(None)
+                return dirty
+
+        target.fill(background_color)
+        BlitQueue._blit_all(target, blits)
+        return None
+
+    @staticmethod
+    def _blit_all(target, blits):
+        """
+        Do a list of blits (source, dest, area) in target, with one 'Surface.blits' call if target has it (pygame
+        1.9.4 or later), or one 'blit' call for each.
+        """
+        if hasattr(target, "blits"):
+            target.blits(blits, doreturn=0)
+        else:
+            for source, dest, area in blits:
+                target.blit(source, dest, area)
+
+    def mark_dirty(self, rect):
+        """
+        Mark a rect of the target as changed, so 'flush_dirty' redraws it in this frame.
+        """
+        self._marked_dirty.append(rect)
+
+    def reset_dirty(self):
+        """
+        Forget the last frame, so the next 'flush_dirty' redraws everything.
+        """
+        self._last_blits = None
+
+    def __len__(self):
+        return sum(len(blits) for blits in self._blits_by_target.itervalues())
+
+    @property
+    def sort_key(self):
+        """
+        :return: Function that receives a blit (source, dest, area) and returns the key used to sort the blits of
+        each target before flushing, or None to keep the order the blits were pushed.
+        """
+        return self._sort_key
+
+    @sort_key.setter
+    def sort_key(self, sort_key):
+        """
+        Set the function used to sort the blits before flushing. Note that sorting changes which blit is drawn over
+        which, so only use it when the blits don't overlap or the order doesn't matter (see 'by_source').
+        """
+        self._sort_key = sort_key
+
+    @property
+    def flushed_count(self):
+        """
+        :return: Number of blits done in the last flush
+        """
+        return self._flushed_count
+
+    @staticmethod
+    def by_source(blit):
+        """
+        Sort key that groups the blits by source surface, so the same surface is blitted many times in a row.
+        """
+        return id(blit[0])
@@ -0,0 +1,161 @@
+"""
+Broadphases used by the Physics to find which colliders may be colliding.
+A broadphase only returns candidate pairs, the actual collision test is made by the colliders themselves.
+"""
+
+from builtincomponents.collider import Collider
+from configuration import Configuration
+
+
+class Broadphase(object):
+    """
+    Class that defines a broadphase. Broadphases may return different candidate pairs for the same scene (the grid
+    returns the pairs that share an area, sweep and prune the pairs whose bounds overlap), but every pair of
+    colliders that may be colliding must be among them, so the collisions found by the narrowphase are the same and
+    broadphases can be swapped (and benchmarked against each other) without changing the result of the physics.
+    Broadphases must use the 'swept_bounds' of the colliders.
+    """
+
+    def __init__(self):
+        pass
+
+    def add(self, collider):
+        """
+        Called when a collider starts being part of the physics.
+        :param collider: Collider added
+        """
+        pass
+
+    def remove(self, collider):
+        """
+        Called when a collider stops being part of the physics.
+        :param collider: Collider removed
+        """
+        pass
+
+    def get_pairs(self):
+        """
+        Must return a set of tuples (collider_a, collider_b) with all colliders that may be colliding.
+        Each pair must be present only once. Pairs whose layers don't collide and pairs where no collider is awake
+        must not be present (see 'make_pair').
+        :return: Set of candidate pairs.
+        """
+        return set()
+
+    @staticmethod
+    def make_pair(collider_a, collider_b, collision_matrix):
+        """
+        Return a pair of colliders ordered by the id of its game objects, so the same two colliders always
+        generate the same pair. If both colliders are in the same game object, if none of them is awake,
+        or if their layers don't collide, return None.
+        """
+        if not collider_a.is_awake and not collider_b.is_awake:
+            return None
+        if not collider_a.can_collide(collider_b, collision_matrix):
+            return None
+        id_a = collider_a.game_object.id
+        id_b = collider_b.game_object.id
+        if id_a == id_b:
+            return None
+        if id_a < id_b:
+            return collider_a, collider_b
+        return collider_b, collider_a
+
+
+class GridBroadphase(Broadphase):
+    """
+    Broadphase that uses the areas of the world (see 'length_area_world') to find the candidate pairs.
+    Only awake colliders look for candidates in their areas, so static and sleeping colliders cost nothing until
+    a moving one gets near them. A pair that shares more than one area is returned only once.
+    Each layer has its own areas, so the areas of layers that don't collide with a collider are never visited.
+    """
+
+    def get_pairs(self):
+        pairs = set()
+        collision_matrix = Configuration.instance().collision_matrix
+        colliders_by_layer = Collider.get_colliders_by_layer()
+        for collider in Collider.get_awake_colliders():
+            layers_mask = collision_matrix[collider.layer] & collider.mask
+            for layer, colliders_by_area in colliders_by_layer.iteritems():
+                if not layers_mask >> layer & 1:
+                    continue
+                for area in collider.areas:
+                    others = colliders_by_area.get(area)
+                    if others is None:
+                        continue
+                    for other in others:
+                        if other is collider:
+                            continue
+                        pair = Broadphase.make_pair(collider, other, collision_matrix)
+                        if pair is not None:
+                            pairs.add(pair)
+        return pairs
+
+
+class SweepAndPruneBroadphase(Broadphase):
+    """
+    Broadphase that sorts the bounds of all colliders on the x axis and sweeps through them. Only colliders whose
+    bounds overlap on both axis are candidates.
+    The list of endpoints is kept between checks, as the objects move just a bit each frame, the list is almost
+    sorted and insertion sort is almost linear.
+    """
+
+    def __init__(self):
+        super(SweepAndPruneBroadphase, self).__init__()
+        self._endpoints = []
+        self._colliders = set()
+
+    def add(self, collider):
+        if collider in self._colliders:
+            return
+        self._colliders.add(collider)
+        # endpoint: [value, is_max, collider]. on equal values, min comes first, so touching bounds are candidates
+        self._endpoints.append([0, False, collider])
+        self._endpoints.append([0, True, collider])
+
+    def remove(self, collider):
+        if collider not in self._colliders:
+            return
+        self._colliders.remove(collider)
+        self._endpoints = [endpoint for endpoint in self._endpoints if endpoint[2] is not collider]
+
+    def _update_endpoints(self):
+        endpoints = self._endpoints
+        for endpoint in endpoints:
+            left, top, right, bottom = endpoint[2].swept_bounds
+            endpoint[0] = right if endpoint[1] else left
+
+        #  insertion sort, almost linear because the list was sorted in the last check
+        for i in range(1, len(endpoints)):
+            endpoint = endpoints[i]
+            key = (endpoint[0], endpoint[1])
+            j = i - 1
+            while j >= 0 and (endpoints[j][0], endpoints[j][1]) > key:
+                endpoints[j + 1] = endpoints[j]
+                j -= 1
+            endpoints[j + 1] = endpoint
+
+    def get_pairs(self):
+        self._update_endpoints()
+        collision_matrix = Configuration.instance().collision_matrix
+        pairs = set()
+        active = {}
+        for value, is_max, collider in self._endpoints:
+            if is_max:
+                active.pop(collider, None)
+                continue
+            left, top, right, bottom = collider.swept_bounds
+            for other, (other_top, other_bottom) in active.iteritems():
+                if top <= other_bottom and other_top <= bottom:
+                    pair = Broadphase.make_pair(collider, other, collision_matrix)
+                    if pair is not None:
+                        pairs.add(pair)
+            active[collider] = (top, bottom)
+        return pairs
+
+    @property
+    def endpoints(self):
+        """
+        :return: List of endpoints ([value, is_max, collider]) sorted by value
+        """
+        return self._endpoints
@@ -16,10 +16,15 @@ class Camera(Component, IDrawer):
     by changing its size and position.
     """
 
+    #  follow the transform after everything moved
+    update_order = 200
+
     def __init__(self, size=(0, 0)):
         super(Camera, self).__init__()
-        self._rect = Rect()
-        self._rect.size(size)
+        IDrawer.__init__(self)
+        self._rect = Rect((0, 0), size)
+        self._drawn_count = 0
+        self._culled_count = 0
 
     def in_sight(self, game_object):
 
@@ -29,8 +34,8 @@ class Camera(Component, IDrawer):
         :return: True if it is visible. False otherwise.
         """
 
-        return game_object.get_component(IDrawable) is not None and self.transform.collidedict(
-            game_object.get_component(IDrawable).get_rect)
+        drawable = game_object.get_component(IDrawable)
+        return drawable is not None and self._rect.colliderect(drawable.get_rect)
 
     def update(self):
         self._rect.x = self.transform.x
@@ -38,23 +43,77 @@ class Camera(Component, IDrawer):
 
     def draw(self):
         """
-        Draws a game object (only when 'in_camera' is true) using this camera.
+        Draws the game objects that are on sight of this camera. Only the areas of the scene inside the camera
+        are visited (see 'Scene.get_drawables_in_rect'). Static layers are drawn with their cached chunks
+        (see 'Scene.set_static_layer'), between the layers below and above them.
+        """
+        scene = Game.instance().scene
+        static_layers = scene.static_layers
+        static_index = 0
+        drawn_count = 0
+        for game_object in scene.get_drawables_in_rect(self._rect):
+            layer = game_object.get_component(IDrawable).layer
+            while static_index < len(static_layers) and static_layers[static_index] < layer:
+                self.draw_static_layer(static_layers[static_index])
+                static_index += 1
+            if self.draw_game_object(game_object, True):
+                drawn_count += 1
+        for layer in static_layers[static_index:]:
+            self.draw_static_layer(layer)
+        self._drawn_count = drawn_count
+        self._culled_count = scene.drawable_count - scene.static_drawable_count - drawn_count
+
+    def draw_static_layer(self, layer):
+        """
+        Draw the cached chunks of a static layer that are on sight of this camera.
+        :param layer: Static layer
+        :return: Number of chunks drawn
         """
-        game_objects_drawable = Game.instance().scene.get_drawables
-        for game_object in game_objects_drawable:
-            self.draw_game_object(game_object, True)
+        count = 0
+        for surface, chunk_rect in Game.instance().scene.get_static_chunks(layer, self._rect):
+            visible = chunk_rect.clip(self._rect)
+            Game.instance().draw_something(surface, visible.topleft, visible.move(-chunk_rect.x, -chunk_rect.y))
+            count += 1
+        return count
 
     def draw_game_object(self, game_object, validate_in_camera=True):
         """
         Draw a game object using this camera.
         :param game_object: Game object to be draw.
         :param validate_in_camera: If true, only draws the object if 'in_sight' is True.
+        :return: True if the game object was drawn
+        """
+        drawable = game_object.get_component(IDrawable)
+        if drawable is None or not drawable.is_drawing or drawable.drawable is None:
+            return False
+        rect = drawable.get_rect
+        area = drawable.area
+        if not validate_in_camera:
+            Game.instance().draw_something(drawable.drawable, rect.topleft, area)
+            return True
+        visible = rect.clip(self._rect)
+        if visible.width == 0 or visible.height == 0:
+            return False
+        if area is None:
+            area = visible.move(-rect.x, -rect.y)
+        else:
+            area = visible.move(area.x - rect.x, area.y - rect.y)
+        Game.instance().draw_something(drawable.drawable, visible.topleft, area)
+        return True
+
+    @property
+    def drawn_count(self):
+        """
+        :return: Number of game objects drawn by this camera in the last frame
         """
-        if not validate_in_camera and self.in_sight(game_object) and game_object.get_component(IDrawable).is_drawing:
-            pass
-        Game.instance().surface.blit(game_object.get_component(IDrawable).drawable,
-                                     game_object.get_component(IDrawable).get_rect,
-                                     game_object.get_component(IDrawable).get_rect.clip(self._rect))
+        return self._drawn_count
+
+    @property
+    def culled_count(self):
+        """
+        :return: Number of drawable game objects of the scene that were not drawn by this camera in the last frame
+        """
+        return self._culled_count
 
     @property
     def size(self):
@@ -62,10 +121,18 @@ class Camera(Component, IDrawer):
 
     @size.setter
     def size(self, size):
-        self._rect = size
+        self._rect.size = size
+
+    @property
+    def rect(self):
+        """
+        :return: The rect this camera sees
+        """
+        return self._rect
 
     def full_surface(self):
         self.transform.x = 0
         self.transform.y = 0
-        self.transform.width = Configuration.instance().screen_size.width
-        self.transform.height = Configuration.instance().screen_size.height
\ No newline at end of file
+        self.transform.size = Configuration.instance().screen_size
+        self._rect.topleft = (0, 0)
+        self._rect.size = Configuration.instance().screen_size
\ No newline at end of file
@@ -1,6 +1,7 @@
 from pygame import Rect
 from temdisponivellib.component import Component
 from temdisponivellib import length_area_world
+from temdisponivellib import collision_layers
 import math
 
 
@@ -13,25 +14,63 @@ class Collider(Component):
     BOX = 1
     CIRCLE = 2
 
-    _colliders_by_area = {}
+    #  dynamic colliders move and fall asleep when they stop moving, kinematic colliders move but never sleep and
+    # static colliders never move (call 'refresh' if you move one)
+    DYNAMIC = 0
+    KINEMATIC = 1
+    STATIC = 2
+
+    ALL_LAYERS = (1 << collision_layers) - 1
+
+    #  after the components that move the transforms
+    update_order = 100
+
+    #  key: layer, value: dict (key: area, value: set of colliders)
+    _colliders_by_layer = {}
+    _awake_colliders = set()
+    _continuous_colliders = set()
+    _rebinned_count = 0
+    #  changes when an area gets its first collider or loses its last one
+    _areas_version = 0
 
     def __init__(self, x=0, y=0, width=0, height=0):
         super(Collider, self).__init__()
         self._type = None
+        self._layer = 0
+        self._mask = Collider.ALL_LAYERS
+        self._mode = Collider.DYNAMIC
+        self._awake = False
+        self._still_checks = 0
+        self._continuous = False
+        self._last_check_bounds = None
         self._x = x
         self._y = y
         self._width = width
         self._height = height
-        self._changed = False
+        self._changed = True
         self._areas = []
+        self._cell_range = None
         self._last_values = [0, 0, 0, 0]
 
     def start(self):
         #self._update_areas()
-        pass
+        from temdisponivellib.physics import Physics
+        Physics.instance().add_collider(self)
+        if self._mode != Collider.STATIC:
+            self.wake_up()
+        if self._continuous:
+            Collider._continuous_colliders.add(self)
 
     def finish(self):
+        from temdisponivellib.physics import Physics
+        Physics.instance().remove_collider(self)
+        self._set_awake(False)
+        Collider._continuous_colliders.discard(self)
+        self._last_check_bounds = None
         self._remove_from_area(self._areas)
+        self._areas = []
+        self._cell_range = None
+        self._changed = True
 
     def check_collision(self, other):
         """
@@ -41,18 +80,313 @@ class Collider(Component):
         """
         return False
 
+    def contains_point(self, x, y):
+        """
+        :return: True if the point is inside this collider. By default, uses the bounds of the collider.
+        """
+        left, top, right, bottom = self.bounds
+        return left <= x <= right and top <= y <= bottom
+
+    def overlaps_rect(self, left, top, right, bottom):
+        """
+        :return: True if this collider overlaps the given axis-aligned rect. By default, uses the bounds of the
+        collider.
+        """
+        self_left, self_top, self_right, self_bottom = self.bounds
+        return self_left <= right and left <= self_right and self_top <= bottom and top <= self_bottom
+
+    def overlaps_circle(self, x, y, radius):
+        """
+        :return: True if this collider overlaps the given circle. By default, uses the bounds of the collider.
+        """
+        left, top, right, bottom = self.bounds
+        distance_x = x - max(left, min(x, right))
+        distance_y = y - max(top, min(y, bottom))
+        return distance_x * distance_x + distance_y * distance_y <= radius * radius
+
+    def intersect_ray(self, origin_x, origin_y, direction_x, direction_y):
+        """
+        Intersect a ray with this collider. By default, uses the bounds of the collider.
+        :param direction_x: X of the direction of the ray. The direction must be normalized
+        :param direction_y: Y of the direction of the ray.
+        :return: The distance from the origin of the ray to the first point of this collider, or None if the ray
+        doesn't hit this collider. If the origin is inside the collider, returns 0.
+        """
+        left, top, right, bottom = self.bounds
+        distance_in = 0.0
+        distance_out = float("inf")
+        for origin, direction, minimum, maximum in ((origin_x, direction_x, left, right),
+                                                    (origin_y, direction_y, top, bottom)):
+            if direction == 0:
+                if origin < minimum or origin > maximum:
+                    return None
+                continue
+            distance_a = (minimum - origin) / direction
+            distance_b = (maximum - origin) / direction
+            if distance_a > distance_b:
+                distance_a, distance_b = distance_b, distance_a
+            distance_in = max(distance_in, distance_a)
+            distance_out = min(distance_out, distance_b)
+            if distance_in > distance_out:
+                return None
+        return distance_in
+
     @property
     def collider_type(self):
         return self._type
 
+    @property
+    def mode(self):
+        """
+        :return: Collider.DYNAMIC, Collider.KINEMATIC or Collider.STATIC
+        """
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode):
+        self._mode = mode
+        self._changed = True
+        if mode == Collider.STATIC:
+            self._set_awake(False)
+        elif self.game_object is not None:
+            self.wake_up()
+
+    @property
+    def is_awake(self):
+        """
+        :return: True if this collider is moving. Pairs of colliders that are not awake are never checked.
+        """
+        return self._awake
+
+    def wake_up(self):
+        """
+        Wake up this collider, if it is not static.
+        """
+        if self._mode == Collider.STATIC:
+            return
+        self._still_checks = 0
+        self._set_awake(True)
+
+    def sleep(self):
+        """
+        Put this collider to sleep. It will wake up when it moves or when a awake collider starts colliding with it.
+        """
+        self._set_awake(False)
+
+    def refresh(self):
+        """
+        Update the position of a static collider in the next frame. Call this after moving a static game object.
+        """
+        self._changed = True
+
+    def _set_awake(self, awake):
+        self._awake = awake
+        if awake:
+            Collider._awake_colliders.add(self)
+        else:
+            Collider._awake_colliders.discard(self)
+
+    def _count_still_check(self, sleep_checks):
+        """
+        Called by the physics on each check. Dynamic colliders that didn't move for 'sleep_checks' checks fall asleep.
+        """
+        if self._mode != Collider.DYNAMIC:
+            return
+        self._still_checks += 1
+        if self._still_checks >= sleep_checks:
+            self.sleep()
+
+    @property
+    def continuous(self):
+        """
+        :return: Whether this collider uses continuous collision detection. A continuous collider collides with
+        everything it passes through between two collision checks, so fast colliders don't pass through thin ones
+        """
+        return self._continuous
+
+    @continuous.setter
+    def continuous(self, continuous):
+        self._continuous = continuous
+        self._last_check_bounds = None
+        self._changed = True
+        if continuous and self.game_object is not None:
+            Collider._continuous_colliders.add(self)
+        else:
+            Collider._continuous_colliders.discard(self)
+
+    @property
+    def swept_bounds(self):
+        """
+        :return: The bounds of this collider. For continuous colliders, the bounds include everything this
+        collider passed through since the last collision check
+        """
+        bounds = self.bounds
+        last_bounds = self._last_check_bounds
+        if last_bounds is None:
+            return bounds
+        return (min(bounds[0], last_bounds[0]), min(bounds[1], last_bounds[1]),
+                max(bounds[2], last_bounds[2]), max(bounds[3], last_bounds[3]))
+
+    def _end_check(self):
+        """
+        Called by the physics at the end of each collision check on continuous colliders.
+        """
+        bounds = self.bounds
+        #  the swept bounds shrink to the current bounds only if it moved since the last check, a still collider
+        # must not be moved to other areas nor woken up
+        if self._last_check_bounds is not None and self._last_check_bounds != bounds:
+            self._changed = True
+        self._last_check_bounds = bounds
+
+    def check_swept_collision(self, collider):
+        """
+        :return: True if this collider touches the other at any moment since the last collision check.
+        See 'time_of_impact'
+        """
+        return self.time_of_impact(collider) is not None
+
+    def time_of_impact(self, collider):
+        """
+        Find when this collider touched the other one, assuming both moved in a straight line since the
+        last collision check. Only continuous colliders remember where they were in the last check, other colliders
+        are considered still.
+        :return: Number from 0 (last check) to 1 (now) or None if they didn't touch
+        """
+        left, top, right, bottom = self.bounds
+        other_left, other_top, other_right, other_bottom = collider.bounds
+        #  movement of this collider relative to the other one
+        move_x, move_y = Collider._get_movement(self)
+        other_move_x, other_move_y = Collider._get_movement(collider)
+        move_x -= other_move_x
+        move_y -= other_move_y
+
+        center_x, center_y = (left + right) * 0.5, (top + bottom) * 0.5
+        half_w, half_h = (right - left) * 0.5, (bottom - top) * 0.5
+        other_center_x, other_center_y = (other_left + other_right) * 0.5, (other_top + other_bottom) * 0.5
+        other_half_w, other_half_h = (other_right - other_left) * 0.5, (other_bottom - other_top) * 0.5
+
+        return Collider._sweep(self._type, half_w, half_h, center_x - move_x, center_y - move_y, move_x, move_y,
+                               collider.collider_type, other_center_x, other_center_y, other_half_w, other_half_h)
+
+    @staticmethod
+    def _get_movement(collider):
+        last_bounds = collider._last_check_bounds
+        if last_bounds is None:
+            return 0.0, 0.0
+        bounds = collider.bounds
+        return (bounds[0] + bounds[2] - last_bounds[0] - last_bounds[2]) * 0.5, \
+               (bounds[1] + bounds[3] - last_bounds[1] - last_bounds[3]) * 0.5
+
+    @staticmethod
+    def _sweep(moving_type, moving_half_w, moving_half_h, start_x, start_y, move_x, move_y,
+               target_type, target_x, target_y, target_half_w, target_half_h):
+        """
+        Sweep a shape from (start_x, start_y) to (start_x + move_x, start_y + move_y) against a still shape.
+        For circles, the half width is the radius.
+        :return: Number from 0 to 1 of the movement where they touch, or None
+        """
+        if moving_type == Collider.BOX and target_type == Collider.CIRCLE:
+            #  the circle moves relative to the box in the opposite direction
+            return Collider._sweep(target_type, target_half_w, target_half_h, target_x, target_y, -move_x, -move_y,
+                                   moving_type, start_x, start_y, moving_half_w, moving_half_h)
+        if moving_type == Collider.CIRCLE and target_type == Collider.CIRCLE:
+            return Collider._sweep_circle(start_x, start_y, move_x, move_y, target_x, target_y,
+                                          moving_half_w + target_half_w)
+        #  box against box, or circle against the box expanded by the radius
+        time = Collider._sweep_box(start_x, start_y, move_x, move_y, target_x, target_y,
+                                   target_half_w + moving_half_w, target_half_h + moving_half_h)
+        if time is None or moving_type == Collider.BOX:
+            return time
+        hit_x = start_x + move_x * time - target_x
+        hit_y = start_y + move_y * time - target_y
+        if math.fabs(hit_x) <= target_half_w or math.fabs(hit_y) <= target_half_h:
+            return time
+        #  the circle hit the expanded box in one of its corners, so it must hit the corner itself
+        corner_x = target_x + math.copysign(target_half_w, hit_x)
+        corner_y = target_y + math.copysign(target_half_h, hit_y)
+        return Collider._sweep_circle(start_x, start_y, move_x, move_y, corner_x, corner_y, moving_half_w)
+
+    @staticmethod
+    def _sweep_box(start_x, start_y, move_x, move_y, center_x, center_y, half_w, half_h):
+        time_in = 0.0
+        time_out = 1.0
+        for start, move, minimum, maximum in ((start_x, move_x, center_x - half_w, center_x + half_w),
+                                              (start_y, move_y, center_y - half_h, center_y + half_h)):
+            if move == 0:
+                if start < minimum or start > maximum:
+                    return None
+                continue
+            time_a = (minimum - start) / move
+            time_b = (maximum - start) / move
+            if time_a > time_b:
+                time_a, time_b = time_b, time_a
+            time_in = max(time_in, time_a)
+            time_out = min(time_out, time_b)
+            if time_in > time_out:
+                return None
+        return time_in
+
+    @staticmethod
+    def _sweep_circle(start_x, start_y, move_x, move_y, center_x, center_y, radius):
+        from_center_x = start_x - center_x
+        from_center_y = start_y - center_y
+        c = from_center_x * from_center_x + from_center_y * from_center_y - radius * radius
+        if c <= 0:
+            return 0.0
+        a = move_x * move_x + move_y * move_y
+        b = from_center_x * move_x + from_center_y * move_y
+        discriminant = b * b - a * c
+        if a == 0 or b > 0 or discriminant < 0:
+            return None
+        time = (-b - math.sqrt(discriminant)) / a
+        if time > 1:
+            return None
+        return time
+
+    @property
+    def layer(self):
+        """
+        :return: The collision layer of this collider (from 0 to 'collision_layers' - 1)
+        """
+        return self._layer
+
+    @layer.setter
+    def layer(self, layer):
+        if layer < 0 or layer >= collision_layers:
+            raise Exception("Invalid collision layer. " + str(layer))
+        self._remove_from_area(self._areas)
+        self._layer = layer
+        self._insert_in_area(self._areas)
+
+    @property
+    def mask(self):
+        """
+        :return: Bit mask of the layers this collider collides with. Both colliders of a pair must have the layer
+        of the other in its mask, and the layers must collide in 'Configuration.collision_matrix'
+        """
+        return self._mask
+
+    @mask.setter
+    def mask(self, mask):
+        self._mask = mask
+
+    def can_collide(self, collider, collision_matrix):
+        """
+        :param collider: Other collider
+        :param collision_matrix: The collision matrix, see 'Configuration.collision_matrix'
+        :return: True if the layers and masks of both colliders allow them to collide
+        """
+        return (collision_matrix[self._layer] & self._mask) >> collider._layer & 1 and \
+            collider._mask >> self._layer & 1
+
     @property
     def x(self):
         return self._x
 
     @x.setter
     def x(self, x):
-        if self.x == x:
-            pass
+        if self._x == x:
+            return
         self._last_values[0] = self.x
         self._changed = True
         self._x = x
@@ -63,8 +397,8 @@ class Collider(Component):
 
     @y.setter
     def y(self, y):
-        if self.y == y:
-            pass
+        if self._y == y:
+            return
         self._last_values[1] = self.y
         self._changed = True
         self._y = y
@@ -75,8 +409,8 @@ class Collider(Component):
 
     @width.setter
     def width(self, width):
-        if self.width == width:
-            pass
+        if self._width == width:
+            return
         self._last_values[2] = self.width
         self._changed = True
         self._width = width
@@ -87,8 +421,8 @@ class Collider(Component):
 
     @height.setter
     def height(self, height):
-        if self.height == height:
-            pass
+        if self._height == height:
+            return
         self._last_values[3] = self.height
         self._changed = True
         self._height = height
@@ -109,46 +443,97 @@ class Collider(Component):
     def bottom(self):
         return self.y + self.height
 
+    @property
+    def centerx(self):
+        return self._x + self._width / 2.0
+
+    @property
+    def centery(self):
+        return self._y + self._height / 2.0
+
+    @property
+    def bounds(self):
+        """
+        :return: A tuple (left, top, right, bottom) with the axis-aligned bounds of this collider
+        """
+        return self._x, self._y, self._x + self._width, self._y + self._height
+
     def update(self):
         if not self._changed:
-            pass
+            return
         self._update_areas()
         self._changed = False
+        if self.game_object is not None:
+            self.wake_up()
+
+    def fixed_update(self):
+        #  follow the transform between the fixed steps, so each collision check sees where it moved
+        self.update()
 
     def _update_areas(self):
-        last_areas = self._areas
-        current_areas = self._get_areas_of_region(self.as_rect)
-        to_remove = list(set(last_areas) - set(current_areas))
-        to_insert = list(set(current_areas) - set(last_areas))
-        self._remove_from_area(to_remove)
-        self._insert_in_area(to_insert)
+        """
+        Move this collider to the areas it occupies now. Nothing is done if it is still in the same areas.
+        """
+        cell_range = Collider._get_cell_range(*self.swept_bounds)
+        if cell_range == self._cell_range:
+            return
+        last_areas = set(self._areas)
+        current_areas = Collider._get_areas_of_range(cell_range)
+        self._remove_from_area([area for area in last_areas if area not in current_areas])
+        self._insert_in_area([area for area in current_areas if area not in last_areas])
         self._areas = current_areas
+        self._cell_range = cell_range
+        Collider._rebinned_count += 1
 
     def _insert_in_area(self, areas):
         """
-        Insert this collider into the list of colliders by area
+        Insert this collider into the set of colliders by area of its layer
         """
+        colliders_by_area = Collider._colliders_by_layer.get(self._layer)
+        if colliders_by_area is None:
+            colliders_by_area = Collider._colliders_by_layer[self._layer] = {}
         for area in areas:
-            Collider._colliders_by_area.setdefault(area, [])
-            if self not in Collider._colliders_by_area[area]:
-                Collider._colliders_by_area[area].append(self)
+            colliders = colliders_by_area.get(area)
+            if colliders is None:
+                colliders = colliders_by_area[area] = set()
+                Collider._areas_version += 1
+            colliders.add(self)
 
     def _remove_from_area(self, areas):
         """
-        Remove this collider from the list of colliders by area
+        Remove this collider from the set of colliders by area of its layer. Areas left empty are removed.
         """
+        colliders_by_area = Collider._colliders_by_layer.get(self._layer)
+        if colliders_by_area is None:
+            return
         for area in areas:
-            if self in Collider._colliders_by_area[area]:
-                Collider._colliders_by_area[area].remove(self)
+            colliders = colliders_by_area.get(area)
+            if colliders is None:
+                continue
+            colliders.discard(self)
+            if len(colliders) == 0:
+                del colliders_by_area[area]
+                Collider._areas_version += 1
+        if len(colliders_by_area) == 0:
+            del Collider._colliders_by_layer[self._layer]
+
+    @property
+    def areas(self):
+        """
+        :return: List of areas this collider occupies
+        """
+        return self._areas
 
     def get_colliders_my_region(self):
         """
-        :return: List of lists of colliders containing all colliders in the areas of this one. If there is none,
+        :return: List of sets of colliders containing all colliders in the areas of this one. If there is none,
         returns empty list
         """
         colliders = []
         for area in self._areas:
-            colliders.append(Collider._colliders_by_area[area])
+            for colliders_by_area in Collider._colliders_by_layer.itervalues():
+                if area in colliders_by_area:
+                    colliders.append(colliders_by_area[area])
         return colliders
 
     @property
@@ -156,66 +541,110 @@ class Collider(Component):
         """
         :return: This collider as a rect
         """
-        return Rect(self.x, self.y, self.width, self.height)
+        left, top, right, bottom = self.bounds
+        return Rect(left, top, right - left, bottom - top)
 
     @staticmethod
-    def _get_areas_of_region(rect):
-        areas = []
+    def _get_cell_range(left, top, right, bottom):
+        """
+        :return: A tuple (first_x, first_y, last_x, last_y) with the first and last areas (inclusive) that
+        the given bounds occupy.
+        """
+        return (int(left // length_area_world), int(top // length_area_world),
+                int(right // length_area_world), int(bottom // length_area_world))
 
-        #  here we get the number of areas that our height and width can occupy
-        size_x = (rect.width / length_area_world) + 1
-        size_y = (rect.height / length_area_world) + 1
+    @staticmethod
+    def _get_areas_of_range(cell_range):
+        first_x, first_y, last_x, last_y = cell_range
+        return [(x, y) for x in range(first_x, last_x + 1) for y in range(first_y, last_y + 1)]
 
-        #  check to see if our right border is in the next area
-        # this check is necessary because we can have a object that is in the middle of a area
-        # and its end is in another area, so we need to add one in the size
-        if rect.x + rect.width >= length_area_world * ((rect.x / length_area_world) + 1):
-            size_x += 1
+    @staticmethod
+    def _get_areas_of_region(rect):
+        return Collider._get_areas_of_range(Collider._get_cell_range(rect.left, rect.top, rect.right, rect.bottom))
 
-        #  same as x axis
-        if rect.y + rect.height >= length_area_world * ((rect.y / length_area_world) + 1):
-            size_y += 1
+    @staticmethod
+    def get_colliders():
+        """
+        Return a list of sets containing all colliders.
+        Colliders in the same set are in the same area and layer. There's no need to validate collision between
+        game objects of different areas, but colliders of different layers in the same area may collide.
+        """
+        colliders = []
+        for colliders_by_area in Collider._colliders_by_layer.itervalues():
+            colliders.extend(colliders_by_area.itervalues())
+        return colliders
 
-        for i in range(0, size_x):
-            for j in range(0, size_y):
-                x = (rect.x / length_area_world) + i
-                y = (rect.y / length_area_world) + j
-                areas.append((x, y))
+    @staticmethod
+    def get_continuous_colliders():
+        """
+        :return: Set of all continuous colliders
+        """
+        return Collider._continuous_colliders
 
-        return areas
+    @staticmethod
+    def get_awake_colliders():
+        """
+        :return: Set of all colliders that are awake (moving)
+        """
+        return Collider._awake_colliders
 
     @staticmethod
-    def get_colliders():
+    def get_colliders_by_layer():
+        """
+        :return: A dict (key: layer, value: dict (key: area, value: set of colliders)) with all colliders
+        """
+        return Collider._colliders_by_layer
+
+    @staticmethod
+    def get_areas_version():
         """
-        Return a list of lists containing all colliders.
-        Colliders in the same list are in the same area. There's no need to validate collision between game objects
-         of different areas (lists)
+        :return: A number that changes whenever an area gets its first collider or loses its last one, to know when
+        something computed from the occupied areas is stale
         """
-        return Collider._colliders_by_area.values()
+        return Collider._areas_version
 
     @staticmethod
     def get_colliders_by_area(area):
         """
         Return all colliders in the specified area.
-        If the area doesn't have any colliders, return a empty list
+        If the area doesn't have any colliders, return a empty set
         """
-        if area in Collider._colliders_by_area:
-            return Collider._colliders_by_area[area]
-        else:
-            return []
+        colliders = set()
+        for colliders_by_area in Collider._colliders_by_layer.itervalues():
+            if area in colliders_by_area:
+                colliders.update(colliders_by_area[area])
+        return colliders
 
     @staticmethod
     def get_colliders_in_region(rect):
         """
-        Return a list of lists containing all colliders in the given rect
-        Colliders in the same list are in the same area. There's no need to validate collision between game objects
-         of different areas (lists)
+        Return a list of sets containing all colliders in the given rect
+        Colliders in the same set are in the same area and layer. Areas without colliders are not in the list.
         """
         colliders = []
         for area in Collider._get_areas_of_region(rect):
-            colliders.append(Collider._colliders_by_area[area])
+            for colliders_by_area in Collider._colliders_by_layer.itervalues():
+                if area in colliders_by_area:
+                    colliders.append(colliders_by_area[area])
         return colliders
 
+    @staticmethod
+    def get_cells_occupied():
+        """
+        :return: Number of areas that have at least one collider
+        """
+        return sum(len(colliders_by_area) for colliders_by_area in Collider._colliders_by_layer.itervalues())
+
+    @staticmethod
+    def reset_rebinned_count():
+        """
+        Reset the counter of colliders that changed areas.
+        :return: Number of colliders that changed areas since the last reset
+        """
+        count = Collider._rebinned_count
+        Collider._rebinned_count = 0
+        return count
+
 
 class BoxCollider(Collider):
     """
@@ -232,14 +661,16 @@ class BoxCollider(Collider):
         self.height = size[1]
 
     def update(self):
+        if self._mode == Collider.STATIC and not self._changed:
+            return
         self.x = self.transform.left
         self.y = self.transform.top
         super(BoxCollider, self).update()
 
     def check_collision(self, collider):
         if collider.collider_type == Collider.BOX:
-            return (math.fabs(self.x - collider.x) * 2 < (self.width + collider.width)) and \
-                   (math.fabs(self.y - collider.y) * 2 < (self.height + collider.height))
+            return (math.fabs(self.centerx - collider.centerx) * 2 < (self.width + collider.width)) and \
+                   (math.fabs(self.centery - collider.centery) * 2 < (self.height + collider.height))
         elif collider.collider_type == Collider.CIRCLE:
             return collider.check_collision(self)
 
@@ -254,9 +685,12 @@ class CircleCollider(Collider):
 
     def __init__(self, radius):
         super(CircleCollider, self).__init__()
+        self._type = Collider.CIRCLE
         self._radius = radius
 
     def update(self):
+        if self._mode == Collider.STATIC and not self._changed:
+            return
         self.x, self.y = self.transform.centerx, self.transform.centery
         super(CircleCollider, self).update()
 
@@ -266,8 +700,15 @@ class CircleCollider(Collider):
 
     @radius.setter
     def radius(self, radius):
+        if self._radius == radius:
+            return
+        self._changed = True
         self._radius = radius
 
+    @property
+    def bounds(self):
+        return self._x - self._radius, self._y - self._radius, self._x + self._radius, self._y + self._radius
+
     def check_collision(self, collider):
         if collider.collider_type == Collider.CIRCLE:
             return self._collide_with_circle(collider)
@@ -278,21 +719,48 @@ class CircleCollider(Collider):
         distancex = math.fabs(self.x - collider.centerx)
         distancey = math.fabs(self.y - collider.centery)
 
-        if distancex > (collider.width / 2) + self.radius:
+        if distancex > (collider.width / 2.0) + self.radius:
             return False
-        if distancey > (collider.height / 2) + self.radius:
+        if distancey > (collider.height / 2.0) + self.radius:
             return False
 
-        if distancex <= (collider.width / 2):
+        if distancex <= (collider.width / 2.0):
             return True
-        if distancey <= (collider.height / 2):
+        if distancey <= (collider.height / 2.0):
             return True
 
-        real_distancex = distancex - collider.width / 2
-        real_distancey = distancey - collider.height / 2
+        real_distancex = distancex - collider.width / 2.0
+        real_distancey = distancey - collider.height / 2.0
         corner_distance_sq = math.pow(real_distancex, 2) + math.pow(real_distancey, 2)
         return corner_distance_sq <= math.pow(self.radius, 2)
 
+    def contains_point(self, x, y):
+        distance_x = x - self._x
+        distance_y = y - self._y
+        return distance_x * distance_x + distance_y * distance_y <= self._radius * self._radius
+
+    def overlaps_rect(self, left, top, right, bottom):
+        distance_x = self._x - max(left, min(self._x, right))
+        distance_y = self._y - max(top, min(self._y, bottom))
+        return distance_x * distance_x + distance_y * distance_y <= self._radius * self._radius
+
+    def overlaps_circle(self, x, y, radius):
+        distance_x = x - self._x
+        distance_y = y - self._y
+        return distance_x * distance_x + distance_y * distance_y <= (radius + self._radius) ** 2
+
+    def intersect_ray(self, origin_x, origin_y, direction_x, direction_y):
+        from_center_x = origin_x - self._x
+        from_center_y = origin_y - self._y
+        c = from_center_x * from_center_x + from_center_y * from_center_y - self._radius * self._radius
+        if c <= 0:
+            return 0.0
+        b = from_center_x * direction_x + from_center_y * direction_y
+        discriminant = b * b - c
+        if b > 0 or discriminant < 0:
+            return None
+        return -b - math.sqrt(discriminant)
+
     def _collide_with_circle(self, collider):
         distancex = math.fabs(self.x - collider.x)
         distancey = math.fabs(self.y - collider.y)
@@ -301,8 +769,34 @@ class CircleCollider(Collider):
 
         return real_distance <= math.pow(self.radius + collider.radius, 2)
 
+    @property
     def width(self):
-        return self.radius
+        return self._radius * 2
 
+    @property
     def height(self):
-        return self.radius
+        return self._radius * 2
+
+    @property
+    def left(self):
+        return self._x - self._radius
+
+    @property
+    def top(self):
+        return self._y - self._radius
+
+    @property
+    def right(self):
+        return self._x + self._radius
+
+    @property
+    def bottom(self):
+        return self._y + self._radius
+
+    @property
+    def centerx(self):
+        return self._x
+
+    @property
+    def centery(self):
+        return self._y
@@ -0,0 +1,113 @@
+from pygame import font
+from temdisponivellib.game import Game
+from temdisponivellib.contracts import IDrawer
+from temdisponivellib.component import Component
+from temdisponivellib.physics import Physics
+from temdisponivellib.profiler import Profiler
+from temdisponivellib.timeutils import Time
+
+
+class PerformanceOverlay(Component, IDrawer):
+    """
+    Component that draws performance information over the game: the frame rate, the number of game objects,
+    drawables and colliders, the candidate pairs and collisions of the physics, and the component classes that cost
+    the most (see 'Profiler.get_costs').
+    While it is in a scene, the cost of each component class is accounted (see 'Profiler.set_accounting'). When it
+    finishes, the profiler goes back to how it was before.
+    The text is only updated every 'refresh_frames' frames, and the surface of each line is cached, so drawing the
+    overlay is just a few blits. Add it after the cameras, so it is drawn over them.
+    """
+
+    def __init__(self, position=(5, 5), top=5, refresh_frames=15, font_size=18, color=(255, 255, 0),
+                 background_color=(0, 0, 0)):
+        """
+        :param position: Position of the overlay in the screen
+        :param top: Number of component classes shown
+        :param refresh_frames: Number of frames between updates of the text
+        :param font_size: Size of the font
+        :param color: Color of the text
+        :param background_color: Color behind the text, or None for none
+        """
+        super(PerformanceOverlay, self).__init__()
+        IDrawer.__init__(self)
+        self._position = position
+        self._top = top
+        self._refresh_frames = refresh_frames
+        self._font_size = font_size
+        self._color = color
+        self._background_color = background_color
+        self._font = None
+        self._frame_count = 0
+        self._lines = []
+        self._surfaces = []
+        self._surfaces_by_text = {}
+        self._profiler_was_enabled = False
+        self._profiler_was_accounting = False
+
+    def start(self):
+        self._profiler_was_enabled = Profiler.enabled
+        self._profiler_was_accounting = Profiler.accounting
+        Profiler.set_accounting(True)
+        Profiler.instance().reset_costs()
+
+    def finish(self):
+        Profiler.set_accounting(self._profiler_was_accounting)
+        Profiler.enabled = self._profiler_was_enabled
+
+    def update(self):
+        if self._frame_count % self._refresh_frames == 0:
+            self._lines = self.get_lines()
+            self._surfaces = [self._get_text_surface(line) for line in self._lines]
+        self._frame_count += 1
+
+    def draw(self):
+        if len(self._surfaces) == 0:
+            return
+        x, y = self._position
+        line_height = self._surfaces[0].get_height()
+        for index, surface in enumerate(self._surfaces):
+            Game.instance().draw_something(surface, (x, y + index * line_height))
+
+    def get_lines(self):
+        """
+        :return: List with the lines of text of the overlay
+        """
+        scene = Game.instance().scene
+        physics = Physics.instance()
+        lines = ["FPS: %.1f" % Time.instance().frame_rate]
+        if scene is not None:
+            lines.append("Objects: %d  Drawables: %d  Colliders: %d" %
+                         (len(scene.game_objects), scene.drawable_count, physics.collider_count))
+        lines.append("Pairs: %d  Collisions: %d" % (physics.pair_count, len(physics.active_collision)))
+        for name, calls, milliseconds, milliseconds_per_call in Profiler.instance().get_costs(self._top):
+            lines.append("%s: %.2f ms (%.0f calls)" % (name, milliseconds, calls))
+        return lines
+
+    def _get_text_surface(self, text):
+        surface = self._surfaces_by_text.get(text)
+        if surface is None:
+            if self._font is None:
+                if not font.get_init():
+                    font.init()
+                self._font = font.Font(None, self._font_size)
+            #  the numbers change, so old texts are dropped before the cache grows too much
+            if len(self._surfaces_by_text) > 256:
+                self._surfaces_by_text = {}
+            surface = self._font.render(text, True, self._color, self._background_color)
+            self._surfaces_by_text[text] = surface
+        return surface
+
+    @property
+    def lines(self):
+        """
+        :return: The lines of text being drawn
+        """
+        return self._lines
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, position):
+        self._position = position
@@ -1,3 +1,4 @@
+from pygame import Rect
 from temdisponivellib.contracts import IDrawable
 from temdisponivellib.component import Component
 from temdisponivellib.loader import Loader
@@ -6,28 +7,100 @@ from temdisponivellib.loader import Loader
 class SpriteRenderer(Component, IDrawable):
     """
     Class that holds a sprite that will be drawn into a surface.
+    The sprite can be a whole image or a region of a texture atlas (see 'TextureAtlas'), drawn using the area
+    argument of blit.
     """
 
-    def __init__(self, path=""):
+    def __init__(self, path="", region=None):
         """
         Create a sprite renderer. If passed path parameter, this will load the image by its path
         (using Loader.load_image(path, true))
         :param path: Path of the sprite. If None or blank, nothing is  loaded.
+        :param region: Name of the sprite in an atlas. If passed, path is the path of the atlas
+        (loaded with Loader.load_atlas(path))
         :return:
         """
         super(SpriteRenderer, self).__init__()
+        IDrawable.__init__(self)
         self._image_path = path
+        self._region_name = region
         self._image = None
+        self._area = None
+        self._atlas = None
+        self._image_loaded = False
+        self._atlas_loaded = False
 
+    @property
     def drawable(self):
         return self._image
 
+    @property
+    def area(self):
+        return self._area
+
+    @area.setter
+    def area(self, area):
+        """
+        Set the part of the image to draw, or None to draw all of it.
+        """
+        self._area = None if area is None else Rect(area)
+        self._notify_rect_changed()
+
     def load(self):
-        if self._image_path != "":
-            self._image = Loader.load_image(self._image_path)
+        if self._image_path == "" or self._image_loaded or self._atlas_loaded:
+            return
+        if self._region_name is None:
+            self._image = Loader.load_image(self._image_path)[0]
+            self._image_loaded = True
+            Loader.when_converted(self._image, self._on_image_converted)
+        else:
+            atlas = Loader.load_atlas(self._image_path)
+            self._atlas_loaded = True
+            self._set_region(atlas, self._region_name)
+
+    def _on_image_converted(self, image):
+        if self._image_loaded or self._atlas is not None:
+            self._image = image
 
     def unload(self):
+        """
+        Release the image or atlas loaded by 'load' (see 'Loader.release_image' and 'Loader.release_atlas').
+        """
+        self._release_image()
         self._image = None
+        self._area = None
+
+    def _release_image(self):
+        if self._image_loaded:
+            Loader.release_image(self._image)
+            self._image_loaded = False
+        if self._atlas_loaded:
+            Loader.release_atlas(self._atlas)
+            self._atlas_loaded = False
+        self._atlas = None
+
+    def set_region(self, atlas, name):
+        """
+        Draw a region of an atlas.
+        :param atlas: TextureAtlas
+        :param name: Name of the region
+        """
+        self._release_image()
+        self._set_region(atlas, name)
+        self._notify_rect_changed()
+
+    def _set_region(self, atlas, name):
+        self._atlas = atlas
+        self._region_name = name
+        self._image, self._area = atlas.get_region(name)
+        Loader.when_converted(self._image, self._on_image_converted)
+
+    @property
+    def atlas(self):
+        """
+        :return: The atlas of the sprite, or None if the sprite is a whole image
+        """
+        return self._atlas
 
     @property
     def image(self):
@@ -35,9 +108,15 @@ class SpriteRenderer(Component, IDrawable):
 
     @image.setter
     def image(self, image):
+        self._release_image()
         self._image = image
+        self._area = None
+        self._notify_rect_changed()
 
+    @property
     def get_rect(self):
         if self._image is None:
             return self.transform
-        return self._image.get_rect(topleft=(self.transform.x, self.transform.y))
\ No newline at end of file
+        if self._area is not None:
+            return Rect(self.transform.x, self.transform.y, self._area.width, self._area.height)
+        return self._image.get_rect(topleft=(self.transform.x, self.transform.y))
@@ -1,5 +1,7 @@
 from pygame.rect import Rect
 from temdisponivellib.component import Component
+from temdisponivellib.game import Game
+from temdisponivellib.timeutils import Time
 
 
 class Transform(Component, Rect):
@@ -7,7 +9,97 @@ class Transform(Component, Rect):
     """
     Component that every game object has. It contains the position of the game object and some useful
     function for movimentation.
+    With 'Configuration.fixed_timestep', the position before the last fixed step is kept too, to draw between the
+    last two steps (see 'get_interpolated_position').
+    When it changes, the scene is told once per frame (see 'Scene.game_object_moved'), so the scene refreshes only
+    the drawables that moved.
     """
 
+    __slots__ = Component.SLOTS + ("_last_position", "_moved")
+
+    #  attributes that are not part of the rect, setting them is not a move
+    _OWN_ATTRIBUTES = frozenset(__slots__ + ("moved",))
+
     def __init__(self):
-        super(Transform, self).__init__()
\ No newline at end of file
+        super(Transform, self).__init__()
+        self._last_position = None
+        self._moved = False
+
+    def __setattr__(self, name, value):
+        Rect.__setattr__(self, name, value)
+        if name not in Transform._OWN_ATTRIBUTES:
+            self._notify_moved()
+
+    def move_ip(self, *args):
+        Rect.move_ip(self, *args)
+        self._notify_moved()
+
+    def inflate_ip(self, *args):
+        Rect.inflate_ip(self, *args)
+        self._notify_moved()
+
+    def clamp_ip(self, *args):
+        Rect.clamp_ip(self, *args)
+        self._notify_moved()
+
+    def union_ip(self, *args):
+        Rect.union_ip(self, *args)
+        self._notify_moved()
+
+    def unionall_ip(self, *args):
+        Rect.unionall_ip(self, *args)
+        self._notify_moved()
+
+    def normalize(self):
+        Rect.normalize(self)
+        self._notify_moved()
+
+    def _notify_moved(self):
+        if self._moved:
+            return
+        game_object = self._game_object
+        if game_object is None or not game_object.started:
+            return
+        scene = Game.instance().scene
+        if scene is None:
+            return
+        self._moved = True
+        scene.game_object_moved(game_object)
+
+    @property
+    def moved(self):
+        """
+        :return: Whether this transform changed since the scene last refreshed it
+        """
+        return self._moved
+
+    @moved.setter
+    def moved(self, moved):
+        self._moved = moved
+
+    def save_state(self):
+        """
+        Keep the current position as the last position. Called before each fixed step of the game objects that
+        have 'fixed_update'.
+        """
+        self._last_position = (self.x, self.y)
+
+    @property
+    def last_position(self):
+        """
+        :return: Position before the last fixed step, or the current position if no step was run
+        """
+        if self._last_position is None:
+            return self.x, self.y
+        return self._last_position
+
+    def get_interpolated_position(self, alpha=None):
+        """
+        :param alpha: How far (from 0 to 1) between the last position and the current one, or None to use
+        'Time.interpolation_alpha'
+        :return: Tuple (x, y) between the position before the last fixed step and the current one
+        """
+        if alpha is None:
+            alpha = Time.instance().interpolation_alpha
+        last_x, last_y = self.last_position
+        return last_x + (self.x - last_x) * alpha, last_y + (self.y - last_y) * alpha
@@ -1,4 +1,5 @@
 from pygame import Rect
+from temdisponivellib import collision_layers
 import pygame
 
 
@@ -16,7 +17,15 @@ class Configuration(object):
                  title="Game",
                  frame_cap=0,
                  mouse_visible=False,
-                 collision_check_rate=3):
+                 collision_check_rate=3,
+                 collision_matrix=None,
+                 sleep_checks=30,
+                 fixed_timestep=False,
+                 physics_rate=60,
+                 max_physics_steps=5,
+                 dirty_rects=False,
+                 max_dirty_area=0.5,
+                 audio_channels=16):
         if Configuration._instance is None:
             Configuration._instance = self
         else:
@@ -28,6 +37,16 @@ class Configuration(object):
         self._full_screen = full_screen
         self._surface_flags = surface_flags
         self._collision_check_rate = collision_check_rate
+        if collision_matrix is None:
+            collision_matrix = [(1 << collision_layers) - 1] * collision_layers
+        self._collision_matrix = collision_matrix
+        self._sleep_checks = sleep_checks
+        self._fixed_timestep = fixed_timestep
+        self._physics_rate = physics_rate
+        self._max_physics_steps = max_physics_steps
+        self._dirty_rects = dirty_rects
+        self._max_dirty_area = max_dirty_area
+        self._audio_channels = audio_channels
 
     @property
     def title(self):
@@ -83,6 +102,116 @@ class Configuration(object):
     def collision_check_rate(self, rate):
         self._collision_check_rate = rate
 
+    @property
+    def collision_matrix(self):
+        """
+        :return: List with one bit mask per collision layer. Bit 'b' of the mask of layer 'a' is set when
+        colliders of layer 'a' collide with colliders of layer 'b'
+        """
+        return self._collision_matrix
+
+    @collision_matrix.setter
+    def collision_matrix(self, collision_matrix):
+        self._collision_matrix = collision_matrix
+
+    @property
+    def fixed_timestep(self):
+        """
+        :return: Whether the physics runs 'physics_rate' checks per second (True) or one check every
+        'collision_check_rate' frames (False)
+        """
+        return self._fixed_timestep
+
+    @fixed_timestep.setter
+    def fixed_timestep(self, fixed_timestep):
+        self._fixed_timestep = fixed_timestep
+
+    @property
+    def physics_rate(self):
+        """
+        :return: Number of collision checks per second when 'fixed_timestep' is True
+        """
+        return self._physics_rate
+
+    @physics_rate.setter
+    def physics_rate(self, physics_rate):
+        self._physics_rate = physics_rate
+
+    @property
+    def max_physics_steps(self):
+        """
+        :return: Maximum number of collision checks in one frame when 'fixed_timestep' is True. When a frame takes
+        longer than that, the remaining time is dropped, so slow frames don't get slower and slower
+        """
+        return self._max_physics_steps
+
+    @max_physics_steps.setter
+    def max_physics_steps(self, max_physics_steps):
+        self._max_physics_steps = max_physics_steps
+
+    @property
+    def dirty_rects(self):
+        """
+        :return: Whether the game redraws and updates only the parts of the screen that changed (True) or redraws
+        and flips the whole screen every frame (False)
+        """
+        return self._dirty_rects
+
+    @dirty_rects.setter
+    def dirty_rects(self, dirty_rects):
+        self._dirty_rects = dirty_rects
+
+    @property
+    def max_dirty_area(self):
+        """
+        :return: When 'dirty_rects' is True, fraction (0 to 1) of the screen that can change before the game falls
+        back to redraw the whole screen
+        """
+        return self._max_dirty_area
+
+    @max_dirty_area.setter
+    def max_dirty_area(self, max_dirty_area):
+        self._max_dirty_area = max_dirty_area
+
+    @property
+    def audio_channels(self):
+        """
+        :return: Number of mixer channels, the maximum number of sounds playing at the same time (see 'Audio')
+        """
+        return self._audio_channels
+
+    @audio_channels.setter
+    def audio_channels(self, audio_channels):
+        self._audio_channels = audio_channels
+
+    @property
+    def sleep_checks(self):
+        """
+        :return: Number of collision checks a dynamic collider must stay still to fall asleep. 0 means never.
+        """
+        return self._sleep_checks
+
+    @sleep_checks.setter
+    def sleep_checks(self, sleep_checks):
+        self._sleep_checks = sleep_checks
+
+    def set_layers_collide(self, layer_a, layer_b, collide=True):
+        """
+        Set whether colliders of two layers collide with each other.
+        """
+        if collide:
+            self._collision_matrix[layer_a] |= 1 << layer_b
+            self._collision_matrix[layer_b] |= 1 << layer_a
+        else:
+            self._collision_matrix[layer_a] &= ~(1 << layer_b)
+            self._collision_matrix[layer_b] &= ~(1 << layer_a)
+
+    def layers_collide(self, layer_a, layer_b):
+        """
+        :return: True if colliders of the two layers collide with each other
+        """
+        return self._collision_matrix[layer_a] >> layer_b & 1 == 1
+
     @property
     def frame_cap(self):
         """
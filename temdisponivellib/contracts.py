@@ -6,6 +6,8 @@ class IResource(object):
     Class that defines something that must be loaded and unloaded.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -25,8 +27,13 @@ class IResource(object):
 class IUpdatable(object):
     """
     Class that defines something that will be updated in game.
+    The attributes are stored by the subclasses: 'SLOTS' has their names, for subclasses that declare '__slots__'
+    (see 'Component').
     """
 
+    __slots__ = ()
+    SLOTS = ("_is_updating",)
+
     def __init__(self):
         self._is_updating = True
 
@@ -36,6 +43,13 @@ class IUpdatable(object):
     def update(self):
         pass
 
+    def fixed_update(self):
+        """
+        Called once per fixed step, before each collision check, when 'Configuration.fixed_timestep' is True
+        (see 'Physics.update'). Move things here to have the same result at any frame rate.
+        """
+        pass
+
     def finish(self):
         pass
 
@@ -62,6 +76,9 @@ class IDrawer(object):
     Class that defines something that perform drawings into the surface.
     """
 
+    __slots__ = ()
+    SLOTS = ("_is_drawing",)
+
     def __init__(self):
         self._is_drawing = True
 
@@ -93,6 +110,9 @@ class IDrawable(IResource):
     Class that defined something that will be drawn into a surface.
     """
 
+    __slots__ = ()
+    SLOTS = ("_is_drawing", "_layer", "_order_in_layer")
+
     _order_in_layer = 0
 
     def __init__(self):
@@ -111,6 +131,15 @@ class IDrawable(IResource):
         """
         return None
 
+    @property
+    def area(self):
+        """
+        Rect of the part of 'drawable' to draw, like the area argument of 'Surface.blit' (used to draw a region of
+        a texture atlas). None to draw all of it.
+        :return: Rect or None
+        """
+        return None
+
     @property
     def get_rect(self):
         """
@@ -143,7 +172,7 @@ class IDrawable(IResource):
     def layer(self, layer):
         last_layer = self._layer
         self._layer = layer
-        Game.instance().scene.change_layer_or_order(self, last_layer, self.order_in_layer)
+        self._notify_layer_or_order(last_layer, self.order_in_layer)
 
     @property
     def order_in_layer(self):
@@ -153,4 +182,23 @@ class IDrawable(IResource):
     def order_in_layer(self, order):
         last_order = self.order_in_layer
         self._order_in_layer = order
-        Game.instance().scene.current.change_layer_or_order(self, self.layer, last_order)
\ No newline at end of file
+        self._notify_layer_or_order(self.layer, last_order)
+
+    def _notify_rect_changed(self):
+        """
+        Tell the current scene that the rect of this drawable changed without its transform moving (like a new
+        image of another size), so it is refreshed (see 'Scene.game_object_moved').
+        """
+        game_object = getattr(self, "game_object", None)
+        if game_object is None or not game_object.started or Game.instance().scene is None:
+            return
+        Game.instance().scene.game_object_moved(game_object)
+
+    def _notify_layer_or_order(self, last_layer, last_order):
+        """
+        Tell the current scene that the game object of this drawable changed layer or order.
+        """
+        game_object = getattr(self, "game_object", None)
+        if game_object is None or Game.instance().scene is None:
+            return
+        Game.instance().scene.change_layer_or_order(game_object, last_layer, last_order)
\ No newline at end of file
@@ -5,4 +5,14 @@ import traceback
 def handle_exception():
     print traceback.format_exc()
     if temdisponivellib.raise_exception:
-        raise
\ No newline at end of file
+        raise
+
+
+def handle_error(message):
+    """
+    Report an error that is not being handled here, like an exception raised in another thread. Raises it, as an
+    Exception with the message, if 'temdisponivellib.raise_exception' is set.
+    """
+    print message
+    if temdisponivellib.raise_exception:
+        raise Exception(message)
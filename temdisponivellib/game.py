@@ -1,5 +1,9 @@
 from timeutils import Time
 from configuration import Configuration
+from blitqueue import BlitQueue
+from loader import Loader
+from audio import Audio
+from profiler import Profiler
 import pygame
 import errorutils
 
@@ -24,6 +28,18 @@ class Game(object):
         self._events = {}
         self._current_scene = None
         self._next_scene = None
+        self._preload_task = None
+        self._scene_assets = None
+        self._blit_queue = BlitQueue()
+        self._dirty_rects = None
+        self._frame_phases = [("Time.update", self._update_time),
+                              ("Audio.update", self._update_audio),
+                              ("events", self._handle_event),
+                              ("Scene.update", self._update_scene),
+                              ("Scene.draw", self._draw_scene),
+                              ("BlitQueue.flush", self._flush_blits),
+                              ("display.flip", self._flip_display),
+                              ("switch scene", self._switch_scene_if_ready)]
 
     def start(self):
         try:
@@ -49,21 +65,7 @@ class Game(object):
         self._running = True
         while self._running:
             try:
-                Time.instance().update()
-                self._handle_event()
-                # just for safety
-                if self.scene is not None:
-                    self.scene.update()
-                    self.scene.draw()
-                    pygame.display.flip()
-                    self.surface.fill(self.scene.background_color)
-
-                if self._next_scene is not None:
-                    if self.scene is not None:
-                        self.scene.finish()
-                    self._next_scene.start()
-                    self._current_scene = self._next_scene
-                    self._next_scene = None
+                self.run_frame()
             except:
                 errorutils.handle_exception()
         try:
@@ -71,6 +73,82 @@ class Game(object):
         except:
             errorutils.handle_exception()
 
+    def run_frame(self):
+        """
+        Run one frame of the game loop: update the time, the events and the scene, then draw the scene.
+        Called by 'play', can be used to run a given number of frames (like in the benchmarks).
+        Each step of the frame is a phase, timed when the profiler is enabled (see 'Profiler').
+        """
+        if Profiler.enabled:
+            Profiler.instance().run_frame(self._frame_phases)
+        else:
+            for name, phase in self._frame_phases:
+                phase()
+
+    def _update_time(self):
+        Time.instance().update()
+
+    def _update_audio(self):
+        Audio.instance().update()
+
+    def _update_scene(self):
+        # just for safety
+        if self.scene is not None:
+            self.scene.update()
+
+    def _draw_scene(self):
+        if self.scene is not None:
+            self.scene.draw()
+
+    def _flush_blits(self):
+        """
+        Do the blits of the frame. With 'Configuration.dirty_rects', only what changed is redrawn
+        (see 'BlitQueue.flush_dirty').
+        """
+        if self.scene is None:
+            return
+        if Configuration.instance().dirty_rects:
+            self._dirty_rects = self._blit_queue.flush_dirty(self.surface, self.scene.background_color,
+                                                             Configuration.instance().max_dirty_area)
+        else:
+            self._blit_queue.flush()
+
+    def _flip_display(self):
+        """
+        Show the frame. With 'Configuration.dirty_rects', only the rects that changed are updated.
+        """
+        if self.scene is None:
+            return
+        if Configuration.instance().dirty_rects:
+            if self._dirty_rects is None:
+                pygame.display.flip()
+            elif len(self._dirty_rects) > 0:
+                pygame.display.update(self._dirty_rects)
+        else:
+            pygame.display.flip()
+            self.surface.fill(self.scene.background_color)
+
+    def _switch_scene_if_ready(self):
+        if self._next_scene is not None and self.next_scene_ready:
+            self._switch_scene()
+
+    def _switch_scene(self):
+        preload_task = self._preload_task
+        if preload_task is not None:
+            preload_task.finish()
+            for path, exception in preload_task.errors:
+                errorutils.handle_error("Could not preload " + path + ": " + str(exception))
+        if self.scene is not None:
+            self.scene.finish()
+        self._next_scene.start()
+        self._blit_queue.reset_dirty()
+        self._current_scene = self._next_scene
+        self._next_scene = None
+        #  the assets of the last scene are released only now, so the ones shared with the new scene stay loaded
+        if self._scene_assets is not None:
+            self._scene_assets.release()
+        self._scene_assets = preload_task
+        self._preload_task = None
 
     def quit(self):
         """
@@ -98,11 +176,31 @@ class Game(object):
     @scene.setter
     def scene(self, scene):
         """
-        Set the next scene.
+        Set the next scene. If the scene has assets in its manifest (see 'Scene.manifest'), they start being loaded
+        in background and the current scene keeps running until they are all loaded (see 'loading_progress').
         :param scene: Scene to set.
         :return: None
         """
         self._next_scene = scene
+        self._preload_task = None
+        if scene is not None and len(scene.manifest) > 0:
+            self._preload_task = Loader.preload(scene.manifest)
+
+    @property
+    def next_scene_ready(self):
+        """
+        :return: True if the assets of the next scene are loaded, so it can start
+        """
+        return self._preload_task is None or self._preload_task.done
+
+    @property
+    def loading_progress(self):
+        """
+        :return: Fraction (0 to 1) of the assets of the next scene already loaded, 1 if there is nothing to load
+        """
+        if self._preload_task is None:
+            return 1.0
+        return self._preload_task.progress
 
     @property
     def events(self):
@@ -129,13 +227,24 @@ class Game(object):
                 self._events.setdefault(pyevent.type, [])
                 self._events[pyevent.type].append(pyevent)
 
-    def draw_something(self, drawable, position, area):
+    def draw_something(self, drawable, position, area=None, target=None):
         """
         Draw something in screen. This function must be called inside "draw" lifecycle hook
+        The blit is queued in the 'blit_queue' and done at the end of the frame, with all others.
         :param drawable: Something to draw
+        :param target: Surface to draw into. If None, the surface of the game
         :return: None
         """
-        self.surface.blit(drawable, position, area)
+        if target is None:
+            target = self.surface
+        self._blit_queue.push(target, drawable, position, area)
+
+    @property
+    def blit_queue(self):
+        """
+        :return: The queue (see 'BlitQueue') with the blits of this frame. It is flushed after the scene is drawn.
+        """
+        return self._blit_queue
 
     @staticmethod
     def instance():
@@ -148,4 +257,7 @@ class Game(object):
         Updated screen and stuff based on the current configuration
         """
         self.surface = pygame.display.set_mode(Configuration.instance().screen_size,
-                                                               Configuration.instance().surface_flags)
\ No newline at end of file
+                                                               Configuration.instance().surface_flags)
+        self._blit_queue.reset_dirty()
+        Loader.convert_pending_images()
+        Audio.instance().set_configuration()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from builtincomponents.transform import Transform
 from contracts import *
+from temdisponivellib import callback_functions
 import errorutils
 
 
@@ -9,27 +10,36 @@ class GameObject(IUpdatable):
     Class that represents a game object.
 
     A game object is a object in the game. This object can contain multiples components.
-    This components are hooked in the lifecycle of the game object, so when the game object update, all its components
-    that are marked as updatable are updated with it. Same for draw.
+    This components are hooked in the lifecycle of the game object: while the game object is in a scene and is
+    updating, its components that override 'update' are updated by the scene (see 'Scene.update'). Same for draw.
+    A game object that overrides 'update' is updated too, after the components.
+
+    GameObject declares '__slots__', so there can be lots of them. Subclasses without '__slots__' get a
+    '__dict__' and can have any attribute.
 
     This allow the components to control and manipulate properties of the game object and others components.
     """
 
-    _id = 0
+    __slots__ = IUpdatable.SLOTS + ("_id", "_tag", "_name", "_components", "_components_remove", "_components_add",
+                                     "_collision_handlers", "_is_drawing", "_started", "_persistent")
+
+    _last_id = 0
     _started_game_object_by_tag = {}
     _started_game_object_by_id = {}
     _started_game_object_by_name = {}
 
     def __init__(self):
         super(GameObject, self).__init__()
-        self._id = GameObject._id + 1
+        self._id = GameObject._last_id + 1
         self._tag = self.__class__
         self._name = "GameObject " + str(self._id)
-        GameObject._id += 1
+        GameObject._last_id += 1
         self._components = {}
-        self._components_remove = []
-        self._components_add = []
-        self.is_drawing = False
+        #  lists of components waiting to be removed or added, created only when needed
+        self._components_remove = None
+        self._components_add = None
+        self._collision_handlers = {}
+        self._is_drawing = False
         self._started = False
         self._persistent = False
         self._add_component(Transform())
@@ -64,6 +74,18 @@ class GameObject(IUpdatable):
             self._started_game_object_by_name.setdefault(self._name, [])
         self._started_game_object_by_name[self._name].append(self)
 
+    @property
+    def is_drawing(self):
+        """
+        Whether this game object is drawn. Stored in the same attribute as 'IDrawer.is_drawing', so a game object
+        that is also a drawer (like Scene) has one value.
+        """
+        return self._is_drawing
+
+    @is_drawing.setter
+    def is_drawing(self, is_drawing):
+        self._is_drawing = is_drawing
+
     @property
     def started(self):
         return self._started
@@ -72,16 +94,6 @@ class GameObject(IUpdatable):
     def transform(self):
         return self.get_component(Transform)
 
-    def update(self):
-        if not self.is_updating:
-            pass
-        for component in self._components.values():
-            try:
-                component.update()
-            except:
-                errorutils.handle_exception()
-        self._update_component_list()
-
     def start(self):
         GameObject._started_game_object_by_tag.setdefault(self.tag, [])
         GameObject._started_game_object_by_name.setdefault(self.name, [])
@@ -111,14 +123,15 @@ class GameObject(IUpdatable):
         Game.instance().scene.remove_game_object(self)
 
     def _update_component_list(self):
-        for component in self._components_remove:
-            self._remove_component(component)
-
-        for component in self._components_add:
-            self._add_component(component)
+        if self._components_remove is not None:
+            for component in self._components_remove:
+                self._remove_component(component)
+            self._components_remove = None
 
-        self._components_add = []
-        self._components_remove = []
+        if self._components_add is not None:
+            for component in self._components_add:
+                self._add_component(component)
+            self._components_add = None
 
     def add_component(self, component):
         """
@@ -127,7 +140,11 @@ class GameObject(IUpdatable):
         This method sets the 'game_object' instance of the component to this game object. It also call the start
         method of the component.
         """
+        if self._components_add is None:
+            self._components_add = []
         self._components_add.append(component)
+        if self.started:
+            Game.instance().scene.game_object_components_changed(self)
 
     def remove_component(self, component):
         """
@@ -136,7 +153,11 @@ class GameObject(IUpdatable):
         This function sets the 'game_object' property of the component to None. It also call the 'finish' method of
         the component
         """
+        if self._components_remove is None:
+            self._components_remove = []
         self._components_remove.append(component)
+        if self.started:
+            Game.instance().scene.game_object_components_changed(self)
 
     def _add_component(self, component):
         if component.is_unique:
@@ -157,27 +178,32 @@ class GameObject(IUpdatable):
             except:
                 errorutils.handle_exception()
 
+        component.game_object = self
         if self.started:
             Game.instance().scene.game_object_add_component(self, component)
 
-        component.game_object = self
+        self._update_collision_handlers()
         try:
             component.start()
         except:
                 errorutils.handle_exception()
 
     def _remove_component(self, component):
-        if component.__class__ not in self._components:
-            pass
+        if isinstance(component, IDrawable) and component.is_unique:
+            key = IDrawable
+        else:
+            key = component.__class__
+        if key not in self._components:
+            return
 
-        if type(self._components[component.__class__]) is list:
-            if component in self._components[component.__class__]:
-                self._components[component.__class__].remove(component)
+        if type(self._components[key]) is list:
+            if component in self._components[key]:
+                self._components[key].remove(component)
         else:
             if isinstance(component, IDrawable):
                 self._components[IDrawable] = None
             else:
-                del self._components[component.__class__]
+                del self._components[key]
 
         if isinstance(component, IResource):
             try:
@@ -189,11 +215,33 @@ class GameObject(IUpdatable):
             Game.instance().scene.game_object_remove_component(self, component)
 
         component.game_object = None
+        self._update_collision_handlers()
         try:
             component.finish()
         except:
                 errorutils.handle_exception()
 
+    def _update_collision_handlers(self):
+        """
+        Rebuild the lists of collision callbacks (see 'callback_functions') of the components of this game object.
+        """
+        handlers = {}
+        for component in self.get_all_components():
+            for callback in callback_functions:
+                handler = getattr(component, callback, None)
+                if handler is not None:
+                    handlers.setdefault(callback, []).append(handler)
+        self._collision_handlers = handlers
+
+    def get_collision_handlers(self, callback):
+        """
+        Return the bound methods of the components of this game object for a given collision callback.
+        If no component has it, return a empty list
+        """
+        if callback not in self._collision_handlers:
+            return []
+        return self._collision_handlers[callback]
+
     def get_component(self, key):
         """
         Return only one component of a given type.
@@ -206,6 +254,20 @@ class GameObject(IUpdatable):
         else:
             return self._components[key]
 
+    def get_all_components(self):
+        """
+        Return a list with all components of this game object.
+        """
+        all_components = []
+        for components in self._components.values():
+            if components is None:
+                continue
+            if type(components) is list:
+                all_components.extend(components)
+            else:
+                all_components.append(components)
+        return all_components
+
     def get_components(self, key):
         """
         Return a list of components of a given type.
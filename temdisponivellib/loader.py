@@ -1,39 +1,778 @@
 from pygame import image as pyimage
 from pygame import mixer
+from pygame import display
+from pygame import RLEACCEL
+from pygame import SRCALPHA
+from pygame import Rect
+from pygame import Surface
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+from weakref import WeakKeyDictionary
+from archive import AssetArchive
 import traceback
+import json
 import os
 
 
+class ImageCache(object):
+    """
+    Cache of the images loaded by the Loader. Images are shared: loading the same file (with the same flags) again
+    returns the same surface, so it must not be modified by who loaded it.
+    Each load counts a reference that must be released (see 'Loader.release_image'). Images without references are
+    kept, so loading them again is free, until the bytes of all images pass 'max_bytes'. Then the images without
+    references are evicted, least recently used first. Images with references are never evicted.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self._max_bytes = max_bytes
+        self._entries = {}
+        self._key_by_image = {}
+        #  images replaced by 'replace', while someone still holds them
+        self._key_by_replaced_image = WeakKeyDictionary()
+        self._unreferenced = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def acquire(self, key, load_function):
+        """
+        Return the image of the key, loading it with load_function if it isn't cached, and count a reference to it.
+        :param key: Key of the image (resolved path and flags)
+        :param load_function: Function without parameters that loads the image
+        :return: The image
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            image = load_function()
+            entry = self._entries[key] = [image, 0, ImageCache.get_image_bytes(image)]
+            self._key_by_image[image] = key
+            self._bytes += entry[2]
+        else:
+            self._hits += 1
+            self._unreferenced.pop(key, None)
+        entry[1] += 1
+        self._evict()
+        return entry[0]
+
+    def release(self, image):
+        """
+        Release a reference to an image. When an image has no references left it can be evicted.
+        :param image: Image returned by 'acquire'
+        :return: True if the image was in the cache
+        """
+        key = self._get_key(image)
+        if key is None:
+            return False
+        entry = self._entries[key]
+        if entry[1] > 0:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._unreferenced[key] = None
+                self._evict()
+        return True
+
+    def replace(self, key, image):
+        """
+        Replace the image of a key, keeping its references. Used when a image is converted (see
+        'Loader.convert_pending_images'). Who still holds the old image can release it as before, it counts for the
+        key.
+        """
+        entry = self._entries[key]
+        del self._key_by_image[entry[0]]
+        self._key_by_replaced_image[entry[0]] = key
+        self._key_by_image[image] = key
+        size = ImageCache.get_image_bytes(image)
+        self._bytes += size - entry[2]
+        entry[0] = image
+        entry[2] = size
+        self._evict()
+
+    def clear(self):
+        """
+        Evict all images without references.
+        """
+        for key in self._unreferenced.keys():
+            self._remove(key)
+        self._unreferenced.clear()
+
+    def get_references(self, image):
+        """
+        :return: Number of references to the image, or 0 if it isn't in the cache
+        """
+        key = self._get_key(image)
+        if key is None:
+            return 0
+        return self._entries[key][1]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _evict(self):
+        while self._bytes > self._max_bytes and len(self._unreferenced) > 0:
+            key, value = self._unreferenced.popitem(last=False)
+            self._remove(key)
+            self._evictions += 1
+
+    def get_image(self, key):
+        """
+        :return: The image of the key, or None if it isn't cached. No reference is counted
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[0]
+
+    def _get_key(self, image):
+        key = self._key_by_image.get(image)
+        if key is None and image in self._key_by_replaced_image:
+            key = self._key_by_replaced_image[image]
+        return key
+
+    def _remove(self, key):
+        image, references, size = self._entries.pop(key)
+        del self._key_by_image[image]
+        for replaced_image, replaced_key in self._key_by_replaced_image.items():
+            if replaced_key == key:
+                del self._key_by_replaced_image[replaced_image]
+        self._bytes -= size
+
+    @property
+    def max_bytes(self):
+        """
+        :return: Budget of bytes. Images without references are evicted while the cache holds more than this
+        """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        self._max_bytes = max_bytes
+        self._evict()
+
+    @property
+    def bytes(self):
+        """
+        :return: Bytes held by the cached images (with references or not)
+        """
+        return self._bytes
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    @property
+    def stats(self):
+        """
+        :return: Dictionary with the hits, misses, evictions, number of images and bytes held
+        """
+        return {"hits": self._hits, "misses": self._misses, "evictions": self._evictions,
+                "images": len(self._entries), "bytes": self._bytes}
+
+    def reset_stats(self):
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def get_image_bytes(image):
+        """
+        :return: Bytes used by the pixels of an image
+        """
+        return image.get_pitch() * image.get_height()
+
+
+class AssetManifest(object):
+    """
+    List of the assets a scene needs, so they can be loaded in background before the scene starts
+    (see 'Scene.manifest' and 'Loader.preload').
+    """
+
+    def __init__(self):
+        self._images = []
+        self._sounds = []
+
+    def add_image(self, path, concat=True, colorkey=None, rle=False):
+        """
+        Add an image. The parameters are the same of 'Loader.load_image', use the same values to get the preloaded
+        image.
+        """
+        self._images.append((path, concat, colorkey, rle))
+
+    def add_sound(self, path):
+        """
+        Add a sound. The path is the same of 'Loader.load_sound'.
+        """
+        self._sounds.append(path)
+
+    @property
+    def images(self):
+        return self._images
+
+    @property
+    def sounds(self):
+        return self._sounds
+
+    def __len__(self):
+        return len(self._images) + len(self._sounds)
+
+
+class PreloadTask(object):
+    """
+    Assets of a manifest being loaded in background (see 'Loader.preload').
+    Files are read and decoded by the threads of the Loader. When the task is 'done', 'finish' must be called from
+    the main thread: it converts the images and puts them in the cache. From then on, the assets stay resident
+    (they hold a reference) until 'release' is called.
+    """
+
+    def __init__(self, manifest, pool):
+        self._images = []
+        self._sounds = []
+        self._errors = []
+        self._finished = False
+        self._resident_images = []
+        self._resident_sounds = []
+        for path, concat, colorkey, rle in manifest.images:
+            key, full_path = Loader.get_image_key(path, concat, colorkey, rle)
+            if key in Loader.image_cache:
+                result = None
+            else:
+                result = pool.apply_async(Loader._read_image, (full_path,))
+            self._images.append((key, full_path, result))
+        for path in manifest.sounds:
+            key = Loader.get_asset_key(path)
+            if key in Loader._sounds:
+                result = None
+            else:
+                result = pool.apply_async(Loader._read_sound, (path,))
+            self._sounds.append((key, result))
+
+    @property
+    def total(self):
+        """
+        :return: Number of assets of the task
+        """
+        return len(self._images) + len(self._sounds)
+
+    @property
+    def loaded_count(self):
+        """
+        :return: Number of assets already loaded (or that failed to load)
+        """
+        count = 0
+        for key, full_path, result in self._images:
+            if result is None or result.ready():
+                count += 1
+        for key, result in self._sounds:
+            if result is None or result.ready():
+                count += 1
+        return count
+
+    @property
+    def progress(self):
+        """
+        :return: Fraction (0 to 1) of the assets already loaded. Useful for loading screens
+        """
+        if self.total == 0:
+            return 1.0
+        return float(self.loaded_count) / self.total
+
+    @property
+    def done(self):
+        """
+        :return: True if all assets were loaded and 'finish' can be called without waiting
+        """
+        return self.loaded_count == self.total
+
+    @property
+    def errors(self):
+        """
+        :return: List of tuples (path, exception) with the assets that failed to load
+        """
+        return self._errors
+
+    def finish(self):
+        """
+        Wait for the assets, then convert the images and make all assets resident. Must be called from the main
+        thread. Assets that failed to load are skipped and added to 'errors'.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        for key, full_path, result in self._images:
+            try:
+                if result is None:
+                    load_function = lambda: Loader._load_image_file(key, full_path)
+                else:
+                    load_function = PreloadTask._get_prepare_function(key, result.get())
+                self._resident_images.append(Loader.image_cache.acquire(key, load_function))
+            except Exception as exception:
+                self._errors.append((full_path, exception))
+        for key, result in self._sounds:
+            try:
+                if result is None:
+                    load_function = lambda: Loader._read_sound(key)
+                else:
+                    load_function = result.get
+                self._resident_sounds.append(Loader._acquire_sound(key, load_function))
+            except Exception as exception:
+                self._errors.append((key, exception))
+
+    def release(self):
+        """
+        Release the assets made resident by 'finish'.
+        """
+        for image in self._resident_images:
+            Loader.release_image(image)
+        for sound in self._resident_sounds:
+            Loader.release_sound(sound)
+        self._resident_images = []
+        self._resident_sounds = []
+
+    @staticmethod
+    def _get_prepare_function(key, image):
+        return lambda: Loader._prepare_image(key, image)
+
+
+class TextureAtlas(object):
+    """
+    Many images packed into a few large surfaces (pages). Each image is a region of a page: draw it blitting the
+    page with the rect of the region as area (see 'SpriteRenderer.set_region').
+    Build an atlas at load time with 'Loader.build_atlas', or offline with 'build' and 'save' and load it with
+    'Loader.load_atlas'.
+    """
+
+    def __init__(self, pages, regions):
+        """
+        :param pages: List of surfaces
+        :param regions: Dictionary with the name of each image as key and a tuple (page index, Rect) as value
+        """
+        self._pages = pages
+        self._regions = regions
+
+    def __contains__(self, name):
+        return name in self._regions
+
+    def __len__(self):
+        return len(self._regions)
+
+    @property
+    def pages(self):
+        return self._pages
+
+    @property
+    def names(self):
+        return self._regions.keys()
+
+    def get_region(self, name):
+        """
+        :return: A tuple (page surface, Rect of the image in the page)
+        """
+        page_index, rect = self._regions[name]
+        return self._pages[page_index], rect
+
+    @staticmethod
+    def _get_replace_function(atlas, page_index):
+        def replace_page(page):
+            atlas.pages[page_index] = page
+        return replace_page
+
+    def save(self, path):
+        """
+        Save the atlas, to be loaded with 'Loader.load_atlas': the index in path (json) and each page in a png
+        beside it (path without extension plus '_<page index>.png').
+        :param path: Path of the index
+        """
+        base_name = os.path.splitext(os.path.basename(path))[0]
+        directory = os.path.dirname(path)
+        page_names = []
+        for page_index, page in enumerate(self._pages):
+            page_name = base_name + "_" + str(page_index) + ".png"
+            pyimage.save(page, os.path.join(directory, page_name))
+            page_names.append(page_name)
+        regions = dict((name, [page_index, rect.x, rect.y, rect.width, rect.height])
+                       for name, (page_index, rect) in self._regions.iteritems())
+        with open(path, "w") as index_file:
+            json.dump({"pages": page_names, "regions": regions}, index_file, indent=1, sort_keys=True)
+
+    @staticmethod
+    def build(images, page_size=(1024, 1024), padding=1):
+        """
+        Pack images into pages (see 'pack') and copy them there.
+        :param images: Dictionary with the name of each image as key and the image as value
+        :param page_size: Maximum size of each page
+        :param padding: Pixels between the images, so filtering or rounding never samples the neighbor image
+        :return: A TextureAtlas
+        """
+        names = sorted(images.keys())
+        places = TextureAtlas.pack([images[name].get_size() for name in names], page_size, padding)
+        page_sizes = {}
+        regions = {}
+        for name, (page_index, x, y) in zip(names, places):
+            rect = Rect((x, y), images[name].get_size())
+            regions[name] = (page_index, rect)
+            width, height = page_sizes.get(page_index, (0, 0))
+            page_sizes[page_index] = (max(width, rect.right), max(height, rect.bottom))
+
+        pages = []
+        for page_index in xrange(len(page_sizes)):
+            page = Surface(page_sizes[page_index], SRCALPHA)
+            page.fill((0, 0, 0, 0))
+            page.blits([(images[name], rect) for name, (index, rect) in regions.iteritems() if index == page_index],
+                       doreturn=0)
+            if display.get_surface() is not None:
+                page = page.convert_alpha()
+            pages.append(page)
+        return TextureAtlas(pages, regions)
+
+    @staticmethod
+    def pack(sizes, page_size=(1024, 1024), padding=1):
+        """
+        Find a place for each size using shelves (first fit decreasing height): the sizes are placed from the
+        highest to the lowest, from left to right, in rows (shelves) as high as the first size placed in them.
+        A size goes to the first shelf with space, or to a new shelf, or to a new page.
+        :param sizes: List of tuples (width, height)
+        :param page_size: Size of each page
+        :param padding: Pixels between the places
+        :return: List with a tuple (page index, x, y) for each size, in the same order
+        """
+        page_width, page_height = page_size
+        order = sorted(xrange(len(sizes)), key=lambda index: (-sizes[index][1], -sizes[index][0]))
+        places = [None] * len(sizes)
+        #  each page: [bottom of the last shelf, shelves], each shelf: [y, height, x where the next place starts]
+        pages = []
+        for index in order:
+            width, height = sizes[index]
+            if width > page_width or height > page_height:
+                raise Exception("Image of size " + str(sizes[index]) + " doesn't fit in a page of size " +
+                                str(page_size))
+            places[index] = TextureAtlas._place(pages, width, height, page_width, page_height, padding)
+        return places
+
+    @staticmethod
+    def _place(pages, width, height, page_width, page_height, padding):
+        for page_index, page in enumerate(pages):
+            for shelf in page[1]:
+                if height <= shelf[1] and shelf[2] + width <= page_width:
+                    x = shelf[2]
+                    shelf[2] += width + padding
+                    return page_index, x, shelf[0]
+            if page[0] + height <= page_height:
+                y = page[0]
+                page[1].append([y, height, width + padding])
+                page[0] += height + padding
+                return page_index, 0, y
+        pages.append([height + padding, [[0, height, width + padding]]])
+        return len(pages) - 1, 0, 0
+
+
 class Loader(object):
     """
     Helper class to load stuff.
+    Assets are read from the packed archive (see 'open_archive') when it has them, and from the files under base_path
+    otherwise.
+    Images are converted to the pixel format of the display once, when loaded, so blitting them doesn't convert each
+    pixel every frame. Images loaded before the display exists are converted when it is created
+    (see 'convert_pending_images').
     """
 
     base_path = "data"
     concat_base_path = True
+    image_cache = ImageCache()
+    preload_workers = 4
+    archive = None
+    _pool = None
+    _sounds = {}
+    _key_by_sound = {}
+    _pending_keys = []
+    _conversion_callbacks = {}
+    _atlases = {}
 
     @staticmethod
     def load_sound(path):
         """
         Load and returns a sound by a given name
+        The sound is shared with everyone that loads the same file. Call 'release_sound' when the sound is not needed
+        anymore. To play it, see 'Audio.play'.
         :param path: Path of the sound.
         :return: A sound.
         """
-        sound = mixer.Sound(path)
+        sound = Loader._acquire_sound(Loader.get_asset_key(path), lambda: Loader._read_sound(path))
         return sound
 
     @staticmethod
-    def load_image(path, concat=True):
+    def release_sound(sound):
+        """
+        Release a sound returned by 'load_sound'. When nobody uses it, it is removed from the cache.
+        :return: True if the sound was loaded by 'load_sound'
+        """
+        key = Loader._key_by_sound.get(sound)
+        if key is None:
+            return False
+        entry = Loader._sounds[key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del Loader._sounds[key]
+            del Loader._key_by_sound[sound]
+        return True
+
+    @staticmethod
+    def _acquire_sound(key, load_function):
+        entry = Loader._sounds.get(key)
+        if entry is None:
+            sound = load_function()
+            entry = Loader._sounds[key] = [sound, 0]
+            Loader._key_by_sound[sound] = key
+        entry[1] += 1
+        return entry[0]
+
+    @staticmethod
+    def load_image(path, concat=True, colorkey=None, rle=False):
         """
         Load a image and returns it. If Loader.concat_base_path is true and concat parameter is true (it is by default)
         the path passed will be concatenated with the base_path of this class, unless
+        The image is shared with everyone that loads the same file (see 'ImageCache'), so it must not be modified.
+        Call 'release_image' when the image is not needed anymore.
+        Images with per pixel alpha are converted with 'convert_alpha', the others with 'convert'.
         :param path: Name of the image.
+        :param colorkey: Color to be transparent, -1 to use the color of the top left pixel, or None for no colorkey.
+        Only used by images without per pixel alpha
+        :param rle: If true and the image has a colorkey, use RLE acceleration. Faster to blit, but slow to access
+        the pixels
         :return: A tuple containing a image and the rect of it.
         """
+        key, full_path = Loader.get_image_key(path, concat, colorkey, rle)
+        image = Loader.image_cache.acquire(key, lambda: Loader._load_image_file(key, full_path))
+        return image, image.get_rect()
+
+    @staticmethod
+    def release_image(image):
+        """
+        Release an image returned by 'load_image', so it can be evicted from the cache.
+        :param image: Image
+        :return: True if the image was loaded by 'load_image'
+        """
+        return Loader.image_cache.release(image)
+
+    @staticmethod
+    def load_atlas(path, concat=True):
+        """
+        Load an atlas saved with 'TextureAtlas.save'. The atlas is shared, like the images (see 'load_image').
+        Call 'release_atlas' when it is not needed anymore.
+        :param path: Path of the index of the atlas
+        :return: A TextureAtlas
+        """
+        full_path = Loader.get_full_path(path, concat)
+        key = Loader.get_asset_key(full_path)
+        entry = Loader._atlases.get(key)
+        if entry is None:
+            index = json.loads(str(Loader._read_file(full_path)))
+            directory = os.path.dirname(full_path)
+            pages = [Loader.load_image(os.path.join(directory, page_name), False)[0] for page_name in index["pages"]]
+            regions = dict((name, (region[0], Rect(region[1:]))) for name, region in index["regions"].iteritems())
+            atlas = TextureAtlas(pages, regions)
+            for page_index, page in enumerate(pages):
+                Loader.when_converted(page, TextureAtlas._get_replace_function(atlas, page_index))
+            entry = Loader._atlases[key] = [atlas, 0]
+        entry[1] += 1
+        return entry[0]
+
+    @staticmethod
+    def release_atlas(atlas):
+        """
+        Release an atlas returned by 'load_atlas'. When nobody uses it, its pages are released.
+        :return: True if the atlas was loaded by 'load_atlas'
+        """
+        for key, entry in Loader._atlases.iteritems():
+            if entry[0] is atlas:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del Loader._atlases[key]
+                    for page in atlas.pages:
+                        Loader.release_image(page)
+                return True
+        return False
+
+    @staticmethod
+    def build_atlas(paths, concat=True, page_size=(1024, 1024), padding=1):
+        """
+        Load images and pack them into a new atlas. The images are named by their paths.
+        :param paths: List of paths, like in 'load_image'
+        :return: A TextureAtlas
+        """
+        images = {}
+        for path in paths:
+            images[path] = Loader.load_image(path, concat)[0]
+        atlas = TextureAtlas.build(images, page_size, padding)
+        for image in images.itervalues():
+            Loader.release_image(image)
+        return atlas
+
+    @staticmethod
+    def open_archive(path):
+        """
+        Open a packed archive of assets (see 'AssetArchive'). From now on, assets are read from it, and only the
+        ones that it doesn't have are read from the files. The names in the archive are relative to base_path.
+        :param path: Path of the archive
+        """
+        Loader.close_archive()
+        Loader.archive = AssetArchive(path)
+
+    @staticmethod
+    def close_archive():
+        if Loader.archive is not None:
+            Loader.archive.close()
+            Loader.archive = None
+
+    @staticmethod
+    def get_archive_name(full_path):
+        """
+        :return: The name of a file in the archive: its path relative to base_path, separated by '/'
+        """
+        return os.path.relpath(full_path, Loader.base_path).replace(os.sep, "/")
+
+    @staticmethod
+    def preload(manifest):
+        """
+        Start loading the assets of a manifest in background, with 'preload_workers' threads.
+        :param manifest: AssetManifest
+        :return: A PreloadTask, to follow the progress and make the assets resident when it is done
+        """
+        if Loader._pool is None:
+            Loader._pool = ThreadPool(Loader.preload_workers)
+        return PreloadTask(manifest, Loader._pool)
+
+    @staticmethod
+    def get_image_key(path, concat=True, colorkey=None, rle=False):
+        """
+        :return: A tuple (key, full_path) with the key of the image in the cache and its full path
+        """
+        full_path = Loader.get_full_path(path, concat)
+        return (Loader.get_asset_key(full_path), (colorkey, rle)), full_path
+
+    @staticmethod
+    def get_asset_key(full_path):
+        """
+        :return: The key of a file in the caches: its name if it is in the archive (see 'get_archive_name'), or else
+        its resolved path. The archive has no links to resolve, and its names are already normalized
+        """
+        archive = Loader.archive
+        if archive is not None:
+            name = Loader.get_archive_name(full_path)
+            if name in archive:
+                return name
+        return os.path.realpath(full_path)
+
+    @staticmethod
+    def get_full_path(path, concat=True):
+        """
+        :return: The path concatenated with the base_path, if Loader.concat_base_path and concat are true
+        """
         if Loader.concat_base_path and concat:
-            full_path = os.path.join(Loader.base_path, path)
-        else:
-            full_path = path
-        image = pyimage.load_basic(full_path)
-        image.convert()
-        return image, image.get_rect()
\ No newline at end of file
+            return os.path.join(Loader.base_path, path)
+        return path
+
+    @staticmethod
+    def is_pending(image):
+        """
+        :return: True if the image was loaded before the display existed and wasn't converted yet
+        """
+        return image in Loader._conversion_callbacks
+
+    @staticmethod
+    def when_converted(image, callback):
+        """
+        Register a function to be called with the converted image when a pending image is converted (see
+        'convert_pending_images'). Who holds a pending image should use it to replace the image, as the old one is
+        slower to draw. Releasing the old image (see 'release_image') still works.
+        If the image isn't pending, nothing is done.
+        :param image: Image returned by 'load_image'
+        :param callback: Function that receives the converted image
+        """
+        callbacks = Loader._conversion_callbacks.get(image)
+        if callbacks is not None:
+            callbacks.append(callback)
+
+    @staticmethod
+    def convert_pending_images():
+        """
+        Convert the images loaded before the display existed. Called by 'Game.set_configuration'.
+        :return: Number of images converted
+        """
+        if display.get_surface() is None:
+            return 0
+        count = 0
+        for key in Loader._pending_keys:
+            image = Loader.image_cache.get_image(key)
+            if image is None:
+                continue
+            converted = Loader._convert(image, *key[1])
+            Loader.image_cache.replace(key, converted)
+            for callback in Loader._conversion_callbacks.pop(image, []):
+                callback(converted)
+            count += 1
+        Loader._pending_keys = []
+        Loader._conversion_callbacks = {}
+        return count
+
+    @staticmethod
+    def _load_image_file(key, full_path):
+        return Loader._prepare_image(key, Loader._read_image(full_path))
+
+    @staticmethod
+    def _read_image(full_path):
+        archive = Loader.archive
+        if archive is not None:
+            name = Loader.get_archive_name(full_path)
+            if name in archive:
+                return archive.load_image(name)
+        return pyimage.load(full_path)
+
+    @staticmethod
+    def _read_file(full_path):
+        archive = Loader.archive
+        if archive is not None:
+            name = Loader.get_archive_name(full_path)
+            if name in archive:
+                return archive.get_buffer(name)
+        with open(full_path, "rb") as read_file:
+            return read_file.read()
+
+    @staticmethod
+    def _read_sound(path):
+        archive = Loader.archive
+        if archive is not None:
+            name = Loader.get_archive_name(path)
+            if name in archive:
+                return archive.load_sound(name)
+        return mixer.Sound(path)
+
+    @staticmethod
+    def _prepare_image(key, image):
+        if display.get_surface() is None:
+            Loader._pending_keys.append(key)
+            Loader._conversion_callbacks[image] = []
+            return image
+        return Loader._convert(image, *key[1])
+
+    @staticmethod
+    def _convert(image, colorkey, rle):
+        if image.get_flags() & SRCALPHA:
+            return image.convert_alpha()
+        image = image.convert()
+        if colorkey is not None:
+            if colorkey == -1:
+                colorkey = image.get_at((0, 0))
+            image.set_colorkey(colorkey, RLEACCEL if rle else 0)
+        return image
@@ -4,7 +4,15 @@ This is a temporary class. In future, hopefully, we will integrate a physics eng
 
 from builtincomponents.collider import Collider
 from configuration import Configuration
-from component import Component
+from timeutils import Time
+from broadphase import GridBroadphase
+from profiler import Profiler
+from timeit import default_timer
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class Physics(object):
@@ -22,59 +30,223 @@ class Physics(object):
             pass
         self._active_collisions = {}
         self._frame_count = 0
+        self._colliders = set()
+        self._broadphase = GridBroadphase()
+        self._batch_narrowphase = False
+        self._colliders_rebinned = 0
+        self._collision_events = {}
+        self._pair_count = 0
+        self._collision_count = 0
 
-    def update(self):
-        if self._frame_count % Configuration.instance().collision_check_rate == 0:
+    def update(self, fixed_update=None):
+        """
+        Check the collisions of this frame.
+        With 'Configuration.fixed_timestep', one check runs per fixed step (see 'Time.fixed_steps'), each one after
+        calling fixed_update, which advances the game by one step (see 'Scene.update'). Without fixed_update,
+        nothing moves between the steps, so at most one check runs.
+        Otherwise one check runs every 'collision_check_rate' frames.
+        :param fixed_update: Function that runs a fixed step, or None
+        """
+        self._colliders_rebinned = Collider.reset_rebinned_count()
+        if Configuration.instance().fixed_timestep:
+            steps = Time.instance().fixed_steps
+            if fixed_update is None:
+                steps = min(steps, 1)
+            for step in xrange(steps):
+                if fixed_update is not None:
+                    fixed_update()
+                self.check_collision()
+        elif self._frame_count % Configuration.instance().collision_check_rate == 0:
             self.check_collision()
         self._frame_count += 1
 
+    def add_collider(self, collider):
+        """
+        Add a collider to the physics. Colliders call this when they start.
+        """
+        self._colliders.add(collider)
+        self._broadphase.add(collider)
+
+    def remove_collider(self, collider):
+        """
+        Remove a collider from the physics. Colliders call this when they finish.
+        """
+        self._colliders.discard(collider)
+        self._broadphase.remove(collider)
+
     def check_collision(self):
         """
-        Collides all colliders that ara in same region
+        Collides all pairs of colliders returned by the broadphase
         :return:
         """
-        print "COLLING"
-        print "---------------------------------------------------------------------------"
-        colliders = Collider.get_colliders()
-        for list_colliders in colliders:
-            print "COLLING ANOTHER AREA"
-            print "---------------------------------------------------------------------------"
-            length = len(list_colliders)
-            for i in range(length):
-                for j in range(i + 1, length):
-                    if j == length - 1:
-                        break
-                    collider_a = list_colliders[i]
-                    collider_b = list_colliders[j]
-                    key_a = (collider_a.game_object.id, collider_b.game_object.id)
-                    key_b = (collider_b.game_object.id, collider_a.game_object.id)
-                    callback = None
-                    if collider_a.check_collision(collider_b):
-                        if key_a in self._active_collisions:
-                            callback = "collision_stay"
-                        elif key_b in self._active_collisions:
-                            callback = "collision_stay"
-                        else:
-                            callback = "collision_enter"
-                            self._active_collisions[key_a] = (collider_a, collider_b)
-                    else:
-                        if key_a in self._active_collisions:
-                            callback = "collision_exit"
-                            del self._active_collisions[key_a]
-                        elif key_b in self._active_collisions:
-                            callback = "collision_exit"
-                            del self._active_collisions[key_b]
-                    if callback is not None:
-                        self._call_callback(callback, collider_a, collider_b)
+        checked = set()
+        pairs = list(self._broadphase.get_pairs())
+        self._pair_count = len(pairs)
+        if self._batch_narrowphase:
+            results = Physics._check_pairs_batch(pairs)
+        else:
+            results = [collider_a.check_collision(collider_b) for collider_a, collider_b in pairs]
+        if len(Collider.get_continuous_colliders()) > 0:
+            for index, (collider_a, collider_b) in enumerate(pairs):
+                if not results[index] and (collider_a.continuous or collider_b.continuous):
+                    results[index] = collider_a.check_swept_collision(collider_b)
+        for (collider_a, collider_b), colliding in zip(pairs, results):
+            key_a = (collider_a.game_object.id, collider_b.game_object.id)
+            key_b = (collider_b.game_object.id, collider_a.game_object.id)
+            checked.add(key_a)
+            checked.add(key_b)
+            callback = None
+            if colliding:
+                if key_a in self._active_collisions:
+                    callback = "collision_stay"
+                elif key_b in self._active_collisions:
+                    callback = "collision_stay"
+                else:
+                    callback = "collision_enter"
+                    self._active_collisions[key_a] = (collider_a, collider_b)
+                    collider_a.wake_up()
+                    collider_b.wake_up()
+            else:
+                if key_a in self._active_collisions:
+                    callback = "collision_exit"
+                    del self._active_collisions[key_a]
+                elif key_b in self._active_collisions:
+                    callback = "collision_exit"
+                    del self._active_collisions[key_b]
+            if callback is not None:
+                self._call_callback(callback, collider_a, collider_b)
+
+        #  active collisions that are not candidates anymore are not colliding, unless both colliders are not awake
+        for key in [key for key in self._active_collisions if key not in checked]:
+            collider_a, collider_b = self._active_collisions[key]
+            if collider_a.game_object is None or collider_b.game_object is None:
+                del self._active_collisions[key]
+            elif collider_a.is_awake or collider_b.is_awake:
+                del self._active_collisions[key]
+                self._call_callback("collision_exit", collider_a, collider_b)
+
+        self._dispatch_collision_events()
+
+        for collider in Collider.get_continuous_colliders():
+            collider._end_check()
+
+        sleep_checks = Configuration.instance().sleep_checks
+        if sleep_checks > 0:
+            for collider in list(Collider.get_awake_colliders()):
+                collider._count_still_check(sleep_checks)
+
+    @staticmethod
+    def _check_pairs_batch(pairs):
+        """
+        Check the collision of all pairs with numpy. The bounds of each collider are packed only once, then the pairs
+        are split by the type of its colliders (box-box, circle-circle and circle-box) and each group is checked
+        with a few vectorized operations.
+        :param pairs: List of tuples (collider_a, collider_b)
+        :return: List of booleans, one for each pair, in the same order
+        """
+        if len(pairs) == 0:
+            return []
+        row_by_collider = {}
+        bounds = []
+        types = []
+        indexes_a = []
+        indexes_b = []
+        for collider_a, collider_b in pairs:
+            row_a = row_by_collider.get(collider_a)
+            if row_a is None:
+                row_a = row_by_collider[collider_a] = len(bounds)
+                bounds.append(collider_a.bounds)
+                types.append(collider_a.collider_type)
+            row_b = row_by_collider.get(collider_b)
+            if row_b is None:
+                row_b = row_by_collider[collider_b] = len(bounds)
+                bounds.append(collider_b.bounds)
+                types.append(collider_b.collider_type)
+            indexes_a.append(row_a)
+            indexes_b.append(row_b)
+
+        bounds = numpy.array(bounds, dtype=numpy.float64)
+        types = numpy.array(types)
+        #  centers and half sizes of every collider. For circles, the half width is the radius
+        center_x = (bounds[:, 0] + bounds[:, 2]) * 0.5
+        center_y = (bounds[:, 1] + bounds[:, 3]) * 0.5
+        half_w = (bounds[:, 2] - bounds[:, 0]) * 0.5
+        half_h = (bounds[:, 3] - bounds[:, 1]) * 0.5
+
+        indexes_a = numpy.array(indexes_a)
+        indexes_b = numpy.array(indexes_b)
+        #  circle-box pairs are checked with the circle always in 'a'
+        swap = (types[indexes_a] == Collider.BOX) & (types[indexes_b] == Collider.CIRCLE)
+        indexes_a, indexes_b = numpy.where(swap, indexes_b, indexes_a), numpy.where(swap, indexes_a, indexes_b)
+        type_a = types[indexes_a]
+        type_b = types[indexes_b]
+
+        distance_x = numpy.abs(center_x[indexes_a] - center_x[indexes_b])
+        distance_y = numpy.abs(center_y[indexes_a] - center_y[indexes_b])
+        half_wa = half_w[indexes_a]
+        half_ha = half_h[indexes_a]
+        half_wb = half_w[indexes_b]
+        half_hb = half_h[indexes_b]
+        results = numpy.zeros(len(pairs), dtype=bool)
+
+        box_box = (type_a == Collider.BOX) & (type_b == Collider.BOX)
+        results[box_box] = (distance_x[box_box] < half_wa[box_box] + half_wb[box_box]) & \
+                           (distance_y[box_box] < half_ha[box_box] + half_hb[box_box])
+
+        circle_circle = (type_a == Collider.CIRCLE) & (type_b == Collider.CIRCLE)
+        dx = distance_x[circle_circle]
+        dy = distance_y[circle_circle]
+        results[circle_circle] = dx * dx + dy * dy <= (half_wa[circle_circle] + half_wb[circle_circle]) ** 2
+
+        circle_box = (type_a == Collider.CIRCLE) & (type_b == Collider.BOX)
+        dx = distance_x[circle_box]
+        dy = distance_y[circle_box]
+        radius = half_wa[circle_box]
+        box_w = half_wb[circle_box]
+        box_h = half_hb[circle_box]
+        corner_x = dx - box_w
+        corner_y = dy - box_h
+        corner_hit = corner_x * corner_x + corner_y * corner_y <= radius * radius
+        results[circle_box] = (dx <= box_w + radius) & (dy <= box_h + radius) & \
+                              ((dx <= box_w) | (dy <= box_h) | corner_hit)
+        return results.tolist()
 
     def _call_callback(self, callback, collider_a, collider_b):
-        for cls in Component.get_class_by_callback(callback):
-            comp_a = collider_a.get_component(cls)
-            comp_b = collider_b.get_component(cls)
-            if comp_a is not None:
-                getattr(comp_a, callback)(collider_b.game_object)
-            if comp_b is not None:
-                getattr(comp_b, callback)(collider_a.game_object)
+        game_object_a = collider_a.game_object
+        game_object_b = collider_b.game_object
+        self._call_game_object_callback(callback, game_object_a, game_object_b)
+        self._call_game_object_callback(callback, game_object_b, game_object_a)
+
+    def _call_game_object_callback(self, callback, game_object, other):
+        if Profiler.components_timed:
+            profiler = Profiler.instance()
+            for handler in game_object.get_collision_handlers(callback):
+                start = default_timer()
+                handler(other)
+                profiler.time_component(handler.__self__, start, default_timer(), callback)
+        else:
+            for handler in game_object.get_collision_handlers(callback):
+                handler(other)
+        #  components with 'collision_events' receive all events of the check at once
+        if len(game_object.get_collision_handlers("collision_events")) > 0:
+            self._collision_events.setdefault(game_object, []).append((callback, other))
+
+    def _dispatch_collision_events(self):
+        """
+        Call 'collision_events' of the components that have it with a list of tuples (callback, other game object)
+        with all collision events of the game object in this check.
+        """
+        collision_events = self._collision_events
+        self._collision_events = {}
+        components_timed = Profiler.components_timed
+        for game_object, events in collision_events.iteritems():
+            for handler in game_object.get_collision_handlers("collision_events"):
+                if components_timed:
+                    start = default_timer()
+                    handler(events)
+                    Profiler.instance().time_component(handler.__self__, start, default_timer(), "collision_events")
+                else:
+                    handler(events)
 
     @property
     def active_collision(self):
@@ -84,6 +256,66 @@ class Physics(object):
         """
         return self._active_collisions
 
+    @property
+    def collider_count(self):
+        """
+        :return: Number of colliders in the physics
+        """
+        return len(self._colliders)
+
+    @property
+    def pair_count(self):
+        """
+        :return: Number of candidate pairs (see 'Broadphase.get_pairs') of the last collision check
+        """
+        return self._pair_count
+
+    @property
+    def colliders_rebinned(self):
+        """
+        :return: Number of colliders that changed areas in the last frame
+        """
+        return self._colliders_rebinned
+
+    @property
+    def cells_occupied(self):
+        """
+        :return: Number of areas that have at least one collider
+        """
+        return Collider.get_cells_occupied()
+
+    @property
+    def broadphase(self):
+        """
+        :return: The broadphase used to find the candidate pairs of colliders
+        """
+        return self._broadphase
+
+    @broadphase.setter
+    def broadphase(self, broadphase):
+        """
+        Set the broadphase used to find the candidate pairs of colliders. All current colliders are added to it.
+        """
+        for collider in self._colliders:
+            broadphase.add(collider)
+        self._broadphase = broadphase
+
+    @property
+    def batch_narrowphase(self):
+        """
+        :return: Whether the collision of the candidate pairs is checked in batch, with numpy
+        """
+        return self._batch_narrowphase
+
+    @batch_narrowphase.setter
+    def batch_narrowphase(self, batch_narrowphase):
+        """
+        Set whether the collision of the candidate pairs is checked in batch, with numpy. Numpy must be installed.
+        """
+        if batch_narrowphase and numpy is None:
+            raise Exception("Batch narrowphase requires numpy.")
+        self._batch_narrowphase = batch_narrowphase
+
     @staticmethod
     def instance():
         if Physics._instance is None:
@@ -0,0 +1,219 @@
+from collections import deque
+from timeit import default_timer
+import json
+
+
+class Profiler(object):
+    """
+    Measures how long each phase of the frames takes (see 'Game.run_frame').
+    While 'Profiler.enabled' is true, the phases of each frame are timed, their durations are kept in a rolling
+    window of frames (see 'get_stats') and the spans of the last frames are kept to be dumped as a trace of
+    Chrome/Perfetto (see 'dump_trace'). While 'Profiler.detailed' is also true, each update system (see
+    'Scene.update'), game object and component update is timed too (see 'capture').
+    With 'set_accounting', the time and number of calls of each component class are summed (see 'get_costs'):
+    updates, draws of the drawers and collision callbacks.
+    When disabled, the profiler costs one check per frame and one per scene update.
+    Change 'detailed' and 'accounting' with 'set_detailed' and 'set_accounting', never directly.
+    Times come from 'timeit.default_timer', the most precise timer of the platform.
+    """
+
+    #  class attributes, so the checks in the hot paths are cheap
+    enabled = False
+    detailed = False
+    accounting = False
+    #  true if the components must be timed, by 'detailed' or by 'accounting'
+    components_timed = False
+
+    _instance = None
+
+    PHASE = "phase"
+    FRAME = "frame"
+    GAME_OBJECT = "game_object"
+    COMPONENT = "component"
+    SYSTEM = "system"
+
+    def __init__(self, window=120, trace_frames=60):
+        """
+        :param window: Number of frames used by the statistics
+        :param trace_frames: Number of frames kept to be dumped as trace
+        """
+        if Profiler._instance is None:
+            Profiler._instance = self
+        else:
+            pass
+        self._window = window
+        self._durations_by_phase = {}
+        self._frames = deque(maxlen=trace_frames)
+        #  spans of the frame being run, None outside of 'run_frame'
+        self._spans = None
+        self._capture_frames = 0
+        self._costs = {}
+        self._accounted_frames = 0
+
+    def run_frame(self, phases):
+        """
+        Run and time the phases of a frame.
+        :param phases: List of tuples (name, function)
+        """
+        self._spans = spans = []
+        frame_start = default_timer()
+        for name, phase in phases:
+            start = default_timer()
+            try:
+                phase()
+            finally:
+                spans.append((name, Profiler.PHASE, start, default_timer()))
+        spans.append(("frame", Profiler.FRAME, frame_start, default_timer()))
+        self._end_frame(spans)
+
+    def add_span(self, name, category, start, end):
+        """
+        Add a span to the current frame. Spans of the 'Profiler.PHASE' category count in the statistics.
+        Ignored outside of 'run_frame' (like when a scene is updated directly), as there is no frame to add it to.
+        :param name: Name of the span
+        :param category: Category of the span
+        :param start: Time the span started (from 'timeit.default_timer')
+        :param end: Time the span ended
+        """
+        if self._spans is not None:
+            self._spans.append((name, category, start, end))
+
+    def _end_frame(self, spans):
+        self._spans = None
+        durations = {}
+        for name, category, start, end in spans:
+            if category == Profiler.PHASE or category == Profiler.FRAME:
+                durations[name] = durations.get(name, 0) + end - start
+        for name, duration in durations.iteritems():
+            phase_durations = self._durations_by_phase.get(name)
+            if phase_durations is None:
+                phase_durations = self._durations_by_phase[name] = deque(maxlen=self._window)
+            phase_durations.append(duration)
+        self._frames.append(spans)
+        if Profiler.accounting:
+            self._accounted_frames += 1
+        if self._capture_frames > 0:
+            self._capture_frames -= 1
+            if self._capture_frames == 0:
+                Profiler.set_detailed(False)
+
+    def time_component(self, component, start, end, category=COMPONENT):
+        """
+        Count the time of a call of a component: as a span if 'detailed', in the costs if 'accounting'.
+        :param component: Component called
+        :param start: Time the call started
+        :param end: Time the call ended
+        :param category: Category of the span
+        """
+        component_class = component.__class__
+        if Profiler.detailed and self._spans is not None:
+            self._spans.append((component_class.__name__, category, start, end))
+        if Profiler.accounting:
+            cost = self._costs.get(component_class)
+            if cost is None:
+                cost = self._costs[component_class] = [0, 0.0]
+            cost[0] += 1
+            cost[1] += end - start
+
+    def get_costs(self, count=None):
+        """
+        :param count: Maximum number of component classes returned, or None for all
+        :return: List of tuples (class name, calls per frame, milliseconds per frame, milliseconds per call) of the
+        component classes, sorted from the most expensive. Averaged over the frames since accounting started or
+        'reset_costs' was called
+        """
+        frames = max(self._accounted_frames, 1)
+        costs = [(component_class.__name__, float(calls) / frames, seconds * 1000 / frames, seconds * 1000 / calls)
+                 for component_class, (calls, seconds) in self._costs.iteritems()]
+        costs.sort(key=lambda cost: cost[2], reverse=True)
+        if count is not None:
+            costs = costs[:count]
+        return costs
+
+    def reset_costs(self):
+        self._costs = {}
+        self._accounted_frames = 0
+
+    def capture(self, frames=1):
+        """
+        Time every game object and component update in the next frames, then go back to timing only the phases.
+        Enables the profiler.
+        :param frames: Number of frames
+        """
+        Profiler.enabled = True
+        Profiler.set_detailed(True)
+        self._capture_frames = frames
+
+    @staticmethod
+    def set_detailed(detailed):
+        """
+        Time (or stop timing) every game object and component update, as spans of the trace.
+        """
+        Profiler.detailed = detailed
+        Profiler.components_timed = Profiler.detailed or Profiler.accounting
+
+    @staticmethod
+    def set_accounting(accounting):
+        """
+        Start (or stop) summing the cost of each component class (see 'get_costs'). Starting enables the profiler.
+        """
+        if accounting:
+            Profiler.enabled = True
+        Profiler.accounting = accounting
+        Profiler.components_timed = Profiler.detailed or Profiler.accounting
+
+    def get_stats(self):
+        """
+        :return: Dictionary with the name of each phase (and "frame" for the whole frame) as key and a dictionary
+        with the mean, median, p95 and max (in milliseconds) over the window, and the number of samples, as value
+        """
+        stats = {}
+        for name, durations in self._durations_by_phase.iteritems():
+            values = sorted(duration * 1000 for duration in durations)
+            stats[name] = {"mean": sum(values) / len(values),
+                           "median": values[len(values) // 2],
+                           "p95": values[min(int(len(values) * 0.95), len(values) - 1)],
+                           "max": values[-1],
+                           "samples": len(values)}
+        return stats
+
+    def get_trace(self):
+        """
+        :return: The frames kept, in the trace event format of Chrome/Perfetto (a dictionary with "traceEvents")
+        """
+        events = []
+        origin = None
+        for spans in self._frames:
+            for name, category, start, end in spans:
+                if origin is None or start < origin:
+                    origin = start
+        for spans in self._frames:
+            for name, category, start, end in spans:
+                events.append({"name": name, "cat": category, "ph": "X", "pid": 1, "tid": 1,
+                               "ts": (start - origin) * 1000000, "dur": (end - start) * 1000000})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump_trace(self, path):
+        """
+        Save the frames kept as a trace, to be opened in chrome://tracing or ui.perfetto.dev.
+        :param path: Path of the json file
+        """
+        with open(path, "w") as trace_file:
+            json.dump(self.get_trace(), trace_file)
+
+    def reset(self):
+        """
+        Forget the statistics and the frames kept.
+        """
+        self._durations_by_phase = {}
+        self._frames.clear()
+
+    @property
+    def window(self):
+        return self._window
+
+    @staticmethod
+    def instance():
+        if Profiler._instance is None:
+            Profiler._instance = Profiler()
+        return Profiler._instance
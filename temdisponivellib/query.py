@@ -0,0 +1,194 @@
+"""
+Spatial queries over the colliders, using the same areas (see 'length_area_world') the physics uses.
+"""
+
+from builtincomponents.collider import Collider
+from temdisponivellib import length_area_world
+import math
+
+
+class Query(object):
+    """
+    Helper class to find colliders in a region of the world.
+    All queries return each collider only once and accept a bit mask of the layers to look for
+    (see 'Collider.layer'). Only colliders that were already updated once (that are in some area) are found.
+    """
+
+    #  tuple (areas version, layers, range of the occupied areas) of the last 'raycast'
+    _occupied_range = (None, None, None)
+
+    @staticmethod
+    def query_rect(rect, layers=Collider.ALL_LAYERS):
+        """
+        :param rect: Rect (or anything with left, top, right and bottom) of the region
+        :param layers: Bit mask of the layers to look for
+        :return: List of colliders that overlap the rect
+        """
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        found = set()
+        for colliders in Query._get_colliders_in_range(Collider._get_cell_range(left, top, right, bottom), layers):
+            for collider in colliders:
+                if collider not in found and collider.overlaps_rect(left, top, right, bottom):
+                    found.add(collider)
+        return list(found)
+
+    @staticmethod
+    def query_point(point, layers=Collider.ALL_LAYERS):
+        """
+        :param point: Tuple (x, y)
+        :param layers: Bit mask of the layers to look for
+        :return: List of colliders that contain the point
+        """
+        x, y = point
+        found = set()
+        for colliders in Query._get_colliders_in_range(Collider._get_cell_range(x, y, x, y), layers):
+            for collider in colliders:
+                if collider not in found and collider.contains_point(x, y):
+                    found.add(collider)
+        return list(found)
+
+    @staticmethod
+    def query_circle(center, radius, layers=Collider.ALL_LAYERS):
+        """
+        :param center: Tuple (x, y) with the center of the circle
+        :param radius: Radius of the circle
+        :param layers: Bit mask of the layers to look for
+        :return: List of colliders that overlap the circle
+        """
+        x, y = center
+        cell_range = Collider._get_cell_range(x - radius, y - radius, x + radius, y + radius)
+        found = set()
+        for colliders in Query._get_colliders_in_range(cell_range, layers):
+            for collider in colliders:
+                if collider not in found and collider.overlaps_circle(x, y, radius):
+                    found.add(collider)
+        return list(found)
+
+    @staticmethod
+    def raycast(origin, direction, max_distance, layers=Collider.ALL_LAYERS):
+        """
+        Cast a ray and return the first collider it hits. The areas are visited in the order the ray passes
+        through them (DDA), so the search stops at the first area that contains a hit. The walk is bounded by
+        the range of areas that have colliders of the layers: it stops when the ray leaves that range (or never
+        enters it), so rays with a huge or infinite max_distance end too.
+        :param origin: Tuple (x, y) with the origin of the ray
+        :param direction: Tuple (x, y) with the direction of the ray. It doesn't have to be normalized
+        :param max_distance: Maximum distance of the ray, float("inf") for no maximum
+        :param layers: Bit mask of the layers to look for
+        :return: A tuple (collider, (x, y), distance) with the collider, the point and the distance of the hit.
+        None if the ray hits nothing.
+        """
+        origin_x, origin_y = float(origin[0]), float(origin[1])
+        length = math.hypot(direction[0], direction[1])
+        if length == 0:
+            return None
+        direction_x = direction[0] / length
+        direction_y = direction[1] / length
+
+        area_x = int(origin_x // length_area_world)
+        area_y = int(origin_y // length_area_world)
+        step_x, next_x, delta_x = Query._get_dda_axis(origin_x, direction_x, area_x)
+        step_y, next_y, delta_y = Query._get_dda_axis(origin_y, direction_y, area_y)
+
+        occupied_range = Query._get_occupied_range(layers)
+        if occupied_range is None:
+            return None
+        first_x, first_y, last_x, last_y = occupied_range
+
+        colliders_by_layer = Collider.get_colliders_by_layer()
+        tested = set()
+        hit = None
+        hit_distance = max_distance
+        while True:
+            #  past the occupied areas in the direction of the ray, nothing else can be hit
+            if (step_x >= 0 and area_x > last_x) or (step_x <= 0 and area_x < first_x) or \
+                    (step_y >= 0 and area_y > last_y) or (step_y <= 0 and area_y < first_y):
+                break
+            for layer, colliders_by_area in colliders_by_layer.iteritems():
+                if not layers >> layer & 1:
+                    continue
+                colliders = colliders_by_area.get((area_x, area_y))
+                if colliders is None:
+                    continue
+                for collider in colliders:
+                    if collider in tested:
+                        continue
+                    tested.add(collider)
+                    distance = collider.intersect_ray(origin_x, origin_y, direction_x, direction_y)
+                    if distance is not None and distance <= hit_distance:
+                        hit = collider
+                        hit_distance = distance
+
+            #  distance where the ray leaves the current area
+            leave_distance = min(next_x, next_y)
+            if leave_distance > max_distance or (hit is not None and hit_distance <= leave_distance):
+                break
+            if next_x < next_y:
+                area_x += step_x
+                next_x += delta_x
+            else:
+                area_y += step_y
+                next_y += delta_y
+
+        if hit is None:
+            return None
+        return hit, (origin_x + direction_x * hit_distance, origin_y + direction_y * hit_distance), hit_distance
+
+    @staticmethod
+    def linecast(start, end, layers=Collider.ALL_LAYERS):
+        """
+        Cast a ray from start to end and return the first collider it hits. See 'raycast'.
+        :return: A tuple (collider, (x, y), distance) or None if the line hits nothing.
+        """
+        direction = (end[0] - start[0], end[1] - start[1])
+        return Query.raycast(start, direction, math.hypot(direction[0], direction[1]), layers)
+
+    @staticmethod
+    def _get_occupied_range(layers):
+        """
+        :return: Tuple (first x, first y, last x, last y) with the range of the areas that have colliders of the
+        layers, or None if there are none. Computed again only when the areas change (see
+        'Collider.get_areas_version')
+        """
+        version = Collider.get_areas_version()
+        last_version, last_layers, occupied_range = Query._occupied_range
+        if last_version == version and last_layers == layers:
+            return occupied_range
+        occupied_range = None
+        for layer, colliders_by_area in Collider.get_colliders_by_layer().iteritems():
+            if not layers >> layer & 1:
+                continue
+            for x, y in colliders_by_area:
+                if occupied_range is None:
+                    occupied_range = (x, y, x, y)
+                else:
+                    occupied_range = (min(occupied_range[0], x), min(occupied_range[1], y),
+                                      max(occupied_range[2], x), max(occupied_range[3], y))
+        Query._occupied_range = (version, layers, occupied_range)
+        return occupied_range
+
+    @staticmethod
+    def _get_dda_axis(origin, direction, area):
+        """
+        :return: A tuple (step, distance to the next area border, distance between area borders) for one axis
+        """
+        if direction > 0:
+            return 1, ((area + 1) * length_area_world - origin) / direction, length_area_world / direction
+        elif direction < 0:
+            return -1, (area * length_area_world - origin) / direction, -length_area_world / direction
+        return 0, float("inf"), float("inf")
+
+    @staticmethod
+    def _get_colliders_in_range(cell_range, layers):
+        """
+        :return: Generator of the sets of colliders of the areas in the range that are in the given layers
+        """
+        first_x, first_y, last_x, last_y = cell_range
+        for layer, colliders_by_area in Collider.get_colliders_by_layer().iteritems():
+            if not layers >> layer & 1:
+                continue
+            for x in xrange(first_x, last_x + 1):
+                for y in xrange(first_y, last_y + 1):
+                    colliders = colliders_by_area.get((x, y))
+                    if colliders is not None:
+                        yield colliders
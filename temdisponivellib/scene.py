@@ -1,12 +1,481 @@
 from gameobject import GameObject
 from contracts import *
+from temdisponivellib import length_area_world
+from bisect import bisect_left
+from bisect import insort
+from heapq import merge
+from pygame import Rect
+from pygame import Surface
+from pygame import SRCALPHA
 import errorutils
 from physics import Physics
+from builtincomponents.collider import Collider
+from loader import AssetManifest
+from profiler import Profiler
+from timeit import default_timer
+
+
+class RenderQueue(object):
+    """
+    The drawable game objects of a scene in the order they must be drawn: by layer, then by order in layer.
+    Each layer has a list kept sorted as game objects are added, removed or change layer or order, so iterating
+    the queue never sorts anything.
+    """
+
+    def __init__(self):
+        self._layers = []
+        self._entries_by_layer = {}
+        self._entry_by_game_object = {}
+
+    def __len__(self):
+        return len(self._entry_by_game_object)
+
+    def __contains__(self, game_object):
+        return game_object in self._entry_by_game_object
+
+    def __iter__(self):
+        for layer in self._layers:
+            for entry in self._entries_by_layer[layer]:
+                yield entry[2]
+
+    def add(self, game_object):
+        """
+        Add a game object with a drawable component to the queue.
+        """
+        if game_object in self._entry_by_game_object:
+            return
+        drawable = game_object.get_component(IDrawable)
+        layer = drawable.layer
+        entries = self._entries_by_layer.get(layer)
+        if entries is None:
+            entries = self._entries_by_layer[layer] = []
+            insort(self._layers, layer)
+        #  the id of the game object keeps the entries unique, so the game objects are never compared
+        entry = (drawable.order_in_layer, game_object.id, game_object)
+        insort(entries, entry)
+        self._entry_by_game_object[game_object] = (layer, entry)
+
+    def remove(self, game_object):
+        """
+        Remove a game object from the queue.
+        """
+        layer_entry = self._entry_by_game_object.pop(game_object, None)
+        if layer_entry is None:
+            return
+        layer, entry = layer_entry
+        entries = self._entries_by_layer[layer]
+        del entries[bisect_left(entries, entry)]
+        if len(entries) == 0:
+            del self._entries_by_layer[layer]
+            del self._layers[bisect_left(self._layers, layer)]
+
+    def change(self, game_object):
+        """
+        Move a game object to its new place in the queue, after it changed layer or order in layer.
+        """
+        if game_object not in self._entry_by_game_object:
+            return
+        self.remove(game_object)
+        self.add(game_object)
+
+
+class DrawableIndex(object):
+    """
+    Grid with the drawable game objects of a scene by area (see 'length_area_world'), so cameras only visit the
+    game objects near them.
+    Each area keeps its game objects sorted by layer and order in layer, so the game objects near a rect come out
+    in drawing order by merging the areas (see 'query_sorted'), without sorting anything.
+    """
+
+    def __init__(self):
+        #  key: area, value: sorted list of entries (layer, order in layer, id, game object)
+        self._entries_by_area = {}
+        self._cell_range_by_game_object = {}
+        self._entry_by_game_object = {}
+
+    def __len__(self):
+        return len(self._cell_range_by_game_object)
+
+    def __contains__(self, game_object):
+        return game_object in self._cell_range_by_game_object
+
+    def add(self, game_object):
+        """
+        Add a game object with a drawable component to the grid, or update its areas if it is already there.
+        """
+        drawable = game_object.get_component(IDrawable)
+        cell_range = DrawableIndex._get_cell_range(drawable.get_rect)
+        last_cell_range = self._cell_range_by_game_object.get(game_object)
+        if cell_range == last_cell_range:
+            return
+        entry = self._entry_by_game_object.get(game_object)
+        if entry is None:
+            #  the id of the game object keeps the entries unique, so the game objects are never compared
+            entry = (drawable.layer, drawable.order_in_layer, game_object.id, game_object)
+            self._entry_by_game_object[game_object] = entry
+        if last_cell_range is not None:
+            self._remove_from_areas(entry, last_cell_range)
+        first_x, first_y, last_x, last_y = cell_range
+        for x in xrange(first_x, last_x + 1):
+            for y in xrange(first_y, last_y + 1):
+                entries = self._entries_by_area.get((x, y))
+                if entries is None:
+                    entries = self._entries_by_area[x, y] = []
+                insort(entries, entry)
+        self._cell_range_by_game_object[game_object] = cell_range
+
+    def refresh(self, game_object):
+        """
+        Update the areas of a game object if it is in the grid and moved to another area.
+        """
+        if game_object in self._cell_range_by_game_object:
+            self.add(game_object)
+
+    def change(self, game_object):
+        """
+        Move a game object to its new place in its areas, after it changed layer or order in layer.
+        """
+        if game_object in self._cell_range_by_game_object:
+            self.remove(game_object)
+            self.add(game_object)
+
+    def remove(self, game_object):
+        """
+        Remove a game object from the grid.
+        """
+        cell_range = self._cell_range_by_game_object.pop(game_object, None)
+        entry = self._entry_by_game_object.pop(game_object, None)
+        if cell_range is not None:
+            self._remove_from_areas(entry, cell_range)
+
+    def query(self, rect):
+        """
+        :return: Set of game objects in the areas that the rect occupies. Note that the game objects are
+        not necessarily inside the rect.
+        """
+        found = set()
+        first_x, first_y, last_x, last_y = DrawableIndex._get_cell_range(rect)
+        for x in xrange(first_x, last_x + 1):
+            for y in xrange(first_y, last_y + 1):
+                entries = self._entries_by_area.get((x, y))
+                if entries is not None:
+                    found.update(entry[3] for entry in entries)
+        return found
+
+    def query_sorted(self, rect):
+        """
+        :return: Generator of the entries (layer, order in layer, id, game object) in the areas that the rect
+        occupies, sorted by layer and order in layer, each game object once. The areas are already sorted, so they
+        are just merged. Note that the game objects are not necessarily inside the rect.
+        """
+        first_x, first_y, last_x, last_y = DrawableIndex._get_cell_range(rect)
+        areas = [self._entries_by_area[x, y]
+                 for x in xrange(first_x, last_x + 1) for y in xrange(first_y, last_y + 1)
+                 if (x, y) in self._entries_by_area]
+        if len(areas) == 1:
+            for entry in areas[0]:
+                yield entry
+            return
+        #  a game object in many areas has the same entry in all of them, so its copies come out together
+        last_entry = None
+        for entry in merge(*areas):
+            if entry is not last_entry:
+                yield entry
+                last_entry = entry
+
+    def _remove_from_areas(self, entry, cell_range):
+        first_x, first_y, last_x, last_y = cell_range
+        for x in xrange(first_x, last_x + 1):
+            for y in xrange(first_y, last_y + 1):
+                entries = self._entries_by_area.get((x, y))
+                if entries is None:
+                    continue
+                index = bisect_left(entries, entry)
+                if index < len(entries) and entries[index] is entry:
+                    del entries[index]
+                if len(entries) == 0:
+                    del self._entries_by_area[x, y]
+
+    @staticmethod
+    def _get_cell_range(rect):
+        return (rect.left // length_area_world, rect.top // length_area_world,
+                rect.right // length_area_world, rect.bottom // length_area_world)
+
+
+class UpdateSystem(object):
+    """
+    The components of one class that override 'update' (or 'fixed_update'), kept in a contiguous list so the scene
+    calls that method of all of them in one loop, like a system of an entity component system, instead of visiting
+    each game object.
+    Removing a component moves the last one to its place, so the list is never shifted.
+    """
+
+    UPDATE = "update"
+    FIXED_UPDATE = "fixed_update"
+
+    #  key: (class, method name), value: whether the class overrides that method of 'IUpdatable'
+    _overrides_by_class = {}
+
+    def __init__(self, component_class, method_name=UPDATE):
+        self._component_class = component_class
+        self._method_name = method_name
+        self._method = getattr(component_class, method_name)
+        self._components = []
+        self._index_by_component = {}
+
+    def __len__(self):
+        return len(self._components)
+
+    def __contains__(self, component):
+        return id(component) in self._index_by_component
+
+    def add(self, component):
+        if id(component) in self._index_by_component:
+            return
+        self._index_by_component[id(component)] = len(self._components)
+        self._components.append(component)
+
+    def remove(self, component):
+        index = self._index_by_component.pop(id(component), None)
+        if index is None:
+            return
+        last = self._components.pop()
+        if last is not component:
+            self._components[index] = last
+            self._index_by_component[id(last)] = index
+
+    def update(self):
+        """
+        Call the method of the system in the components whose game object is updating.
+        """
+        method = self._method
+        for component in self._components:
+            if not component.game_object.is_updating:
+                continue
+            try:
+                method(component)
+            except:
+                errorutils.handle_exception()
+
+    def update_timed(self):
+        """
+        Same as 'update', timing each component (see 'Profiler.components_timed').
+        """
+        profiler = Profiler.instance()
+        method = self._method
+        for component in self._components:
+            if not component.game_object.is_updating:
+                continue
+            start = default_timer()
+            try:
+                method(component)
+            except:
+                errorutils.handle_exception()
+            profiler.time_component(component, start, default_timer())
+
+    @property
+    def component_class(self):
+        return self._component_class
+
+    def save_transforms(self):
+        """
+        Keep the current position of the transforms of the components (see 'Transform.save_state').
+        """
+        for component in self._components:
+            component.game_object.transform.save_state()
+
+    @property
+    def method_name(self):
+        return self._method_name
+
+    @property
+    def order(self):
+        """
+        :return: When this system runs in the frame (see 'Component.update_order')
+        """
+        return getattr(self._component_class, "update_order", 0)
+
+    @property
+    def components(self):
+        return self._components
+
+    @staticmethod
+    def overrides_update(updatable_class, method_name=UPDATE):
+        """
+        :return: True if the class overrides the 'update' (or 'fixed_update') method of 'IUpdatable', which does
+        nothing
+        """
+        key = (updatable_class, method_name)
+        overrides = UpdateSystem._overrides_by_class.get(key)
+        if overrides is None:
+            overrides = getattr(updatable_class, method_name).__func__ is not \
+                getattr(IUpdatable, method_name).__func__
+            UpdateSystem._overrides_by_class[key] = overrides
+        return overrides
+
+
+class StaticLayerCache(object):
+    """
+    Pre-rendered surfaces of the static layers of a scene (see 'Scene.set_static_layer').
+    The world is split in square chunks and each chunk of a static layer is rendered once, with all drawables of
+    that layer that overlap it, into a transparent surface. Cameras blit only the chunks they see.
+    A chunk is rendered again only after a drawable of its layer that overlaps it is added, removed or moved.
+    Note that changes in the image of a static drawable are not detected, use 'invalidate' for those.
+    """
+
+    def __init__(self, drawable_index, chunk_size=512):
+        self._drawable_index = drawable_index
+        self._chunk_size = chunk_size
+        self._layers = []
+        self._chunks = {}
+        self._rect_by_game_object = {}
+
+    def __len__(self):
+        return len(self._rect_by_game_object)
+
+    def __contains__(self, game_object):
+        return game_object in self._rect_by_game_object
+
+    @property
+    def layers(self):
+        """
+        :return: Sorted list with the static layers
+        """
+        return self._layers
+
+    def is_static(self, layer):
+        return layer in self._layers
+
+    def set_static(self, layer, static, game_objects):
+        """
+        Make a layer static or not.
+        :param layer: Layer
+        :param static: True to make the layer static
+        :param game_objects: Drawable game objects of the scene, the ones in the layer are added to (or removed
+        from) the cache
+        """
+        if static == self.is_static(layer):
+            return
+        if static:
+            insort(self._layers, layer)
+        else:
+            self._layers.remove(layer)
+        for game_object in game_objects:
+            if game_object.get_component(IDrawable).layer != layer:
+                continue
+            if static:
+                self.add(game_object)
+            else:
+                self.remove(game_object)
+
+    def add(self, game_object):
+        """
+        Add a drawable game object to the cache if its layer is static.
+        """
+        drawable = game_object.get_component(IDrawable)
+        if drawable.layer not in self._layers:
+            return
+        rect = Rect(drawable.get_rect)
+        self._rect_by_game_object[game_object] = (drawable.layer, rect)
+        self.invalidate(drawable.layer, rect)
+
+    def refresh(self, game_object):
+        """
+        Invalidate the chunks of a static game object if it moved or changed size.
+        """
+        last = self._rect_by_game_object.get(game_object)
+        if last is None:
+            return
+        layer, last_rect = last
+        rect = game_object.get_component(IDrawable).get_rect
+        if rect == last_rect:
+            return
+        self.invalidate(layer, last_rect)
+        self.add(game_object)
+
+    def remove(self, game_object):
+        """
+        Remove a game object from the cache, invalidating the chunks where it was.
+        """
+        last = self._rect_by_game_object.pop(game_object, None)
+        if last is not None:
+            self.invalidate(*last)
+
+    def invalidate(self, layer, rect=None):
+        """
+        Discard the chunks of a layer that overlap the rect, so they are rendered again when needed.
+        :param layer: Layer
+        :param rect: Rect, or None to discard all chunks of the layer
+        """
+        if rect is None:
+            for key in [key for key in self._chunks if key[0] == layer]:
+                del self._chunks[key]
+            return
+        first_x, first_y, last_x, last_y = self._get_chunk_range(rect)
+        for x in xrange(first_x, last_x + 1):
+            for y in xrange(first_y, last_y + 1):
+                self._chunks.pop((layer, x, y), None)
+
+    def get_chunks(self, layer, rect):
+        """
+        :return: Generator of tuples (surface, chunk_rect) with the chunks of a static layer that overlap the rect.
+        Chunks without drawables are skipped. Missing chunks are rendered.
+        """
+        first_x, first_y, last_x, last_y = self._get_chunk_range(rect)
+        for x in xrange(first_x, last_x + 1):
+            for y in xrange(first_y, last_y + 1):
+                key = (layer, x, y)
+                chunk = self._chunks.get(key)
+                if chunk is None:
+                    chunk = self._chunks[key] = self._render_chunk(layer, x, y)
+                if chunk is not False:
+                    yield chunk
+
+    @property
+    def chunk_count(self):
+        """
+        :return: Number of chunks rendered and cached (empty chunks included)
+        """
+        return len(self._chunks)
+
+    @property
+    def chunk_size(self):
+        return self._chunk_size
+
+    def _render_chunk(self, layer, x, y):
+        """
+        :return: Tuple (surface, chunk_rect) with the chunk rendered, or False if no drawable of the layer overlaps it
+        """
+        size = self._chunk_size
+        chunk_rect = Rect(x * size, y * size, size, size)
+        found = []
+        for game_object in self._drawable_index.query(chunk_rect):
+            drawable = game_object.get_component(IDrawable)
+            if drawable.layer != layer or not drawable.is_drawing or drawable.drawable is None:
+                continue
+            if chunk_rect.colliderect(drawable.get_rect):
+                found.append((drawable.order_in_layer, game_object.id, drawable))
+        if len(found) == 0:
+            return False
+        found.sort()
+        surface = Surface((size, size), SRCALPHA)
+        surface.blits([(drawable.drawable, drawable.get_rect.move(-chunk_rect.x, -chunk_rect.y), drawable.area)
+                       for order, game_object_id, drawable in found], doreturn=0)
+        return surface, chunk_rect
+
+    def _get_chunk_range(self, rect):
+        size = self._chunk_size
+        return (rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size)
+
 
 class Scene(GameObject, IDrawer):
     """
     Class that represents a scene in the game.
     It is a game object because it behaves like one, so...
+    The components that override 'update' are updated by class, in one 'UpdateSystem' per class, in the order of
+    their 'update_order'. Game objects are only visited to update those that override 'update' themselves.
+    With 'Configuration.fixed_timestep', 'fixed_update' is called the same way once per fixed step, before each
+    collision check (see 'Physics.update').
     """
 
     _persistent_game_objects = []
@@ -15,11 +484,22 @@ class Scene(GameObject, IDrawer):
     def __init__(self):
         super(Scene, self).__init__()
         self._game_objects = {}
-        self._game_objects_drawable = {}
-        self._game_objects_drawer = []
+        self._render_queue = RenderQueue()
+        self._drawers = []
+        self._systems = []
+        self._fixed_systems = []
+        #  key: (class, method name), value: UpdateSystem or None
+        self._system_by_class = {}
+        self._updating_game_objects = []
+        self._fixed_updating_game_objects = []
+        self._changed_game_objects = []
+        self._moved_game_objects = []
+        self._drawable_index = DrawableIndex()
+        self._static_layers = StaticLayerCache(self._drawable_index)
         self._included = []
         self._removed = []
         self._background_color = (0, 0, 0, 0)
+        self._manifest = AssetManifest()
 
     def start(self):
         for game_object in Scene._persistent_game_objects:
@@ -28,19 +508,112 @@ class Scene(GameObject, IDrawer):
         self._update_list_game_object()
 
     def update(self):
-        Physics.instance().update()
+        if Profiler.enabled:
+            start = default_timer()
+            Physics.instance().update(self._get_fixed_update())
+            Profiler.instance().add_span("Physics.update", Profiler.PHASE, start, default_timer())
+        else:
+            Physics.instance().update(self._get_fixed_update())
+        self.update_game_objects()
+
+    def update_game_objects(self):
+        """
+        The part of 'update' after the physics: add and remove the game objects, update the components and game
+        objects, and refresh the ones that moved.
+        """
         if not self.is_updating:
             pass
-        index = 0
         self._update_list_game_object()
-        for game_object in self._game_objects.values():
+        if Profiler.components_timed:
+            self._update_systems_profiled()
+        else:
+            for system in self._systems:
+                system.update()
+        for game_object in self._updating_game_objects:
             if not game_object.is_updating:
                 continue
             try:
-                game_object.update()
+                if Profiler.detailed:
+                    start = default_timer()
+                    game_object.update()
+                    Profiler.instance().add_span(game_object.name, Profiler.GAME_OBJECT, start, default_timer())
+                else:
+                    game_object.update()
             except:
                 errorutils.handle_exception()
-            index += 1
+        self._update_changed_game_objects()
+        self._refresh_moved_game_objects()
+
+    def _get_fixed_update(self):
+        """
+        :return: The function that runs a fixed step, or None if nothing moves in the fixed steps: only colliders,
+        which just follow their transforms, have 'fixed_update'
+        """
+        if len(self._fixed_updating_game_objects) > 0:
+            return self._fixed_update
+        for system in self._fixed_systems:
+            if len(system) > 0 and not issubclass(system.component_class, Collider):
+                return self._fixed_update
+        return None
+
+    def _fixed_update(self):
+        """
+        Run a fixed step: keep the positions of the transforms, so they can be interpolated (see
+        'Transform.get_interpolated_position'), then call 'fixed_update' of the components and game objects.
+        """
+        for system in self._fixed_systems:
+            system.save_transforms()
+        for game_object in self._fixed_updating_game_objects:
+            game_object.transform.save_state()
+        if Profiler.components_timed:
+            self._update_systems_profiled(self._fixed_systems)
+        else:
+            for system in self._fixed_systems:
+                system.update()
+        for game_object in self._fixed_updating_game_objects:
+            if not game_object.is_updating:
+                continue
+            try:
+                game_object.fixed_update()
+            except:
+                errorutils.handle_exception()
+
+    def _update_systems_profiled(self, systems=None):
+        """
+        Update the systems timing each component and, if 'Profiler.detailed', adding a span for each system.
+        """
+        if systems is None:
+            systems = self._systems
+        profiler = Profiler.instance()
+        for system in systems:
+            start = default_timer()
+            system.update_timed()
+            if Profiler.detailed:
+                profiler.add_span(system.component_class.__name__, Profiler.SYSTEM, start, default_timer())
+
+    def _refresh_moved_game_objects(self):
+        """
+        Update the drawable index and the static layers with the game objects that moved (see
+        'game_object_moved').
+        """
+        if len(self._moved_game_objects) == 0:
+            return
+        moved_game_objects = self._moved_game_objects
+        self._moved_game_objects = []
+        for game_object in moved_game_objects:
+            game_object.transform.moved = False
+            self._drawable_index.refresh(game_object)
+            self._static_layers.refresh(game_object)
+
+    def _update_changed_game_objects(self):
+        """
+        Add and remove the components waiting in the game objects that had components added or removed.
+        """
+        while len(self._changed_game_objects) > 0:
+            changed_game_objects = self._changed_game_objects
+            self._changed_game_objects = []
+            for game_object in changed_game_objects:
+                game_object._update_component_list()
 
     def finish(self):
         for game_object in self._game_objects.values():
@@ -52,42 +625,50 @@ class Scene(GameObject, IDrawer):
     def draw(self):
         if not self.is_drawing:
             pass
-        for drawer in self._game_objects_drawer:
+        #  things can move after the update, in the events for example
+        self._refresh_moved_game_objects()
+        components_timed = Profiler.components_timed
+        for drawer in self._drawers:
             if not drawer.is_drawing:
                 continue
             try:
-                drawer.draw()
+                if components_timed:
+                    start = default_timer()
+                    drawer.draw()
+                    Profiler.instance().time_component(drawer, start, default_timer(), "draw")
+                else:
+                    drawer.draw()
             except:
                 errorutils.handle_exception()
 
     def _update_list_game_object(self):
         for game_object in self._included:
             self._game_objects[game_object.id] = game_object
-            if game_object.get_component(IDrawable) is not None:
-                comp = game_object.get_component(IDrawable)
-                self._game_objects_drawable[comp.layer, comp.order_in_layer, game_object.id] = game_object
-            if game_object.get_component(IDrawer) is not None:
-                if game_object not in self._game_objects_drawer:
-                    self._game_objects_drawer.append(game_object)
+            #  a move told to another scene is never refreshed there
+            game_object.transform.moved = False
             try:
                 game_object.start()
             except:
                 errorutils.handle_exception()
+            if UpdateSystem.overrides_update(game_object.__class__):
+                self._updating_game_objects.append(game_object)
+            if UpdateSystem.overrides_update(game_object.__class__, UpdateSystem.FIXED_UPDATE):
+                self._fixed_updating_game_objects.append(game_object)
+            for component in game_object.get_all_components():
+                self.game_object_add_component(game_object, component)
 
         for game_object in self._removed:
             if game_object.id not in self._game_objects:
                 pass
 
             del self._game_objects[game_object.id]
+            if game_object in self._updating_game_objects:
+                self._updating_game_objects.remove(game_object)
+            if game_object in self._fixed_updating_game_objects:
+                self._fixed_updating_game_objects.remove(game_object)
 
-            comp = game_object.get_component(IDrawable)
-            if game_object.get_component(IDrawable) is not None:
-                if (comp.layer, comp.order_in_layer, game_object.id) in self._game_objects_drawable:
-                    del self._game_objects_drawable[comp.layer, comp.order_in_layer, game_object.id]
-
-            if game_object.get_component(IDrawer) is not None:
-                if game_object in self._game_objects_drawer:
-                    self._game_objects_drawer.remove(game_object)
+            for component in game_object.get_all_components():
+                self.game_object_remove_component(game_object, component)
             try:
                 game_object.finish()
             except:
@@ -122,9 +703,80 @@ class Scene(GameObject, IDrawer):
     @property
     def get_drawables(self):
         """
-        :return: A list with all drawables in this scene.
+        :return: The render queue (see 'RenderQueue') with all drawable game objects of this scene, in the order
+        they must be drawn.
+        """
+        return self._render_queue
+
+    def get_drawables_in_rect(self, rect):
+        """
+        :return: A generator of the drawable game objects that overlap the rect, sorted by layer and order in
+        layer (see 'DrawableIndex.query_sorted'). Game objects in static layers are not returned, they are drawn
+        with 'get_static_chunks'.
+        """
+        static_layers = self._static_layers.layers
+        for layer, order, game_object_id, game_object in self._drawable_index.query_sorted(rect):
+            if layer in static_layers:
+                continue
+            drawable = game_object.get_component(IDrawable)
+            if drawable is not None and rect.colliderect(drawable.get_rect):
+                yield game_object
+
+    @property
+    def drawable_count(self):
+        """
+        :return: Number of drawable game objects in this scene
+        """
+        return len(self._drawable_index)
+
+    @property
+    def static_drawable_count(self):
+        """
+        :return: Number of drawable game objects in static layers
+        """
+        return len(self._static_layers)
+
+    @property
+    def static_layers(self):
+        """
+        :return: Sorted list with the static layers of this scene
+        """
+        return self._static_layers.layers
+
+    def set_static_layer(self, layer, static=True):
+        """
+        Make a layer static: its drawables are rendered once into cached chunks (see 'StaticLayerCache') and cameras
+        blit the chunks instead of each drawable. Use it for layers that rarely change, like backgrounds.
+        :param layer: Layer
+        :param static: True to make the layer static, False to draw its drawables one by one again
+        """
+        self._static_layers.set_static(layer, static, self._render_queue)
+
+    def is_static_layer(self, layer):
+        return self._static_layers.is_static(layer)
+
+    def get_static_chunks(self, layer, rect):
+        """
+        :return: Generator of tuples (surface, chunk_rect) with the cached chunks of a static layer that overlap the
+        rect.
+        """
+        return self._static_layers.get_chunks(layer, rect)
+
+    def invalidate_static_layer(self, layer, rect=None):
+        """
+        Render again the chunks of a static layer that overlap the rect (or all chunks if rect is None). Needed only
+        when the image of a static drawable changes, moves, additions and removals are detected.
         """
-        return sorted(self._game_objects_drawable).values()
+        self._static_layers.invalidate(layer, rect)
+
+    @property
+    def manifest(self):
+        """
+        :return: The AssetManifest of this scene. Assets added to it (usually in the constructor) are loaded in
+        background when the scene is set in the Game, and the scene only starts when they are all loaded
+        (see 'Game.scene').
+        """
+        return self._manifest
 
     @property
     def background_color(self):
@@ -137,22 +789,83 @@ class Scene(GameObject, IDrawer):
         :param last_layer: Last layer
         :param last_order: Last order
         """
-        del self._game_objects_drawable[last_layer, last_order]
-        if game_object.get_component(IDrawable) is not None:
-                comp = game_object.get_component(IDrawable)
-                self._game_objects_drawable[comp.layer, comp.order_in_layer] = game_object
+        self._render_queue.change(game_object)
+        if game_object in self._drawable_index:
+            self._drawable_index.change(game_object)
+            self._static_layers.remove(game_object)
+            self._static_layers.add(game_object)
+
+    def game_object_moved(self, game_object):
+        """
+        Callback for when the transform of a started game object changes, or the rect of its drawable changes
+        without the transform moving. The drawable index and the static layers are refreshed only for the game
+        objects that moved, once per frame.
+        """
+        self._moved_game_objects.append(game_object)
+
+    def game_object_components_changed(self, game_object):
+        """
+        Callback for when components are added to or removed from a started game object. The changes are applied
+        after the components are updated.
+        """
+        self._changed_game_objects.append(game_object)
+
+    def get_system(self, component_class, method_name=UpdateSystem.UPDATE):
+        """
+        :param method_name: UpdateSystem.UPDATE or UpdateSystem.FIXED_UPDATE
+        :return: The UpdateSystem of a component class, or None if the class doesn't override the method
+        """
+        key = (component_class, method_name)
+        if key in self._system_by_class:
+            return self._system_by_class[key]
+        system = None
+        if UpdateSystem.overrides_update(component_class, method_name):
+            system = UpdateSystem(component_class, method_name)
+            systems = self._systems if method_name == UpdateSystem.UPDATE else self._fixed_systems
+            #  stable: systems with the same order run in the order they were created
+            index = len(systems)
+            while index > 0 and systems[index - 1].order > system.order:
+                index -= 1
+            systems.insert(index, system)
+        self._system_by_class[key] = system
+        return system
+
+    @property
+    def systems(self):
+        """
+        :return: List with the UpdateSystem of each component class, in the order they are updated
+        """
+        return self._systems
+
+    @property
+    def fixed_systems(self):
+        """
+        :return: List with the UpdateSystem of 'fixed_update' of each component class, in the order they run
+        """
+        return self._fixed_systems
 
     def game_object_add_component(self, game_object, component):
+        for method_name in (UpdateSystem.UPDATE, UpdateSystem.FIXED_UPDATE):
+            system = self.get_system(component.__class__, method_name)
+            if system is not None:
+                system.add(component)
         if isinstance(component, IDrawable):
-            self._game_objects_drawable[component.layer, component.order_in_layer, game_object.id] = game_object
+            self._render_queue.add(game_object)
+            self._drawable_index.add(game_object)
+            self._static_layers.add(game_object)
         if isinstance(component, IDrawer):
-            if game_object not in self._game_objects_drawer:
-                self._game_objects_drawer.append(game_object)
+            if component not in self._drawers:
+                self._drawers.append(component)
 
     def game_object_remove_component(self, game_object, component):
+        for method_name in (UpdateSystem.UPDATE, UpdateSystem.FIXED_UPDATE):
+            system = self._system_by_class.get((component.__class__, method_name))
+            if system is not None:
+                system.remove(component)
         if isinstance(component, IDrawable):
-            if (component.layer, component.order_in_layer, game_object.id) in self._game_objects_drawable:
-                del self._game_objects_drawable[component.layer, component.order_in_layer, game_object.id]
+            self._render_queue.remove(game_object)
+            self._drawable_index.remove(game_object)
+            self._static_layers.remove(game_object)
         if isinstance(component, IDrawer):
-            if game_object in self._game_objects_drawer:
-                self._game_objects_drawer.remove(game_object)
\ No newline at end of file
+            if component in self._drawers:
+                self._drawers.remove(component)
\ No newline at end of file
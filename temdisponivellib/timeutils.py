@@ -16,9 +16,49 @@ class Time(object):
         self._delta_time = 0
         self._time_scale = 1
         self._clock = Clock()
+        self._accumulator = 0
+        self._fixed_steps = 0
+        self._interpolation_alpha = 0
 
     def update(self):
         self._delta_time = self._clock.tick(Configuration.instance().frame_cap )
+        if Configuration.instance().fixed_timestep:
+            self._update_fixed_steps()
+
+    def _update_fixed_steps(self):
+        """
+        Add the time of this frame (scaled, see 'delta_time') to the accumulator and count how many fixed steps fit
+        in it.
+        Steps above 'Configuration.max_physics_steps' are dropped.
+        """
+        fixed_delta_time = self.fixed_delta_time
+        self._accumulator += self.delta_time
+        steps = int(self._accumulator // fixed_delta_time)
+        self._accumulator -= steps * fixed_delta_time
+        self._fixed_steps = min(steps, Configuration.instance().max_physics_steps)
+        self._interpolation_alpha = self._accumulator / fixed_delta_time
+
+    @property
+    def fixed_delta_time(self):
+        """
+        :return: Time, in milliseconds, of each fixed step (see 'Configuration.physics_rate')
+        """
+        return 1000.0 / Configuration.instance().physics_rate
+
+    @property
+    def fixed_steps(self):
+        """
+        :return: Number of fixed steps to run in this frame
+        """
+        return self._fixed_steps
+
+    @property
+    def interpolation_alpha(self):
+        """
+        :return: How far (from 0 to 1) the current frame is between the last fixed step and the next one.
+        Renderers can use it to interpolate between the last two physics states.
+        """
+        return self._interpolation_alpha
 
     @property
     def delta_time(self):